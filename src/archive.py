@@ -0,0 +1,101 @@
+# src/archive.py
+import base64
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+
+from metrics import metrics
+
+ARCHIVE_DIR = "src/data/archive"
+COMPRESS_LEVEL = 6  # zlib default; 9 is much slower for a few percent
+
+logger = logging.getLogger("InternScope")
+
+
+def _day(ts):
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))
+
+
+class ResponseArchive:
+    """
+    Append-only archive of raw board responses, one gzip file per UTC day
+    (responses-YYYY-MM-DD.jsonl.gz). Each record is a JSON line with the fetch time, the source
+    name (e.g. "lever:stripe"), the URL and the body. Records are buffered and flush() appends
+    them as one gzip member, so a file is a valid multi-member gzip stream that is never rewritten.
+    The URLs recorded since this archive was opened are remembered (see has_recorded()).
+    """
+
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._recorded = set()  # URLs recorded by this process
+
+    def path_for(self, day):
+        return os.path.join(self.directory, f"responses-{day}.jsonl.gz")
+
+    def record(self, source, url, body, ts=None):
+        """Buffer one response body (bytes) until the next flush()."""
+        entry = {"ts": ts or time.time(), "source": source, "url": url}
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        with self._lock:
+            self._buffer.append(entry)
+            self._recorded.add(url)
+
+    def has_recorded(self, url):
+        """Whether a response from url was recorded since this archive was opened."""
+        with self._lock:
+            return url in self._recorded
+
+    def flush(self):
+        """Append buffered records to their day's file; returns the number written."""
+        with self._lock:
+            buffer, self._buffer = self._buffer, []
+        if not buffer:
+            return 0
+        by_day = {}
+        for entry in buffer:
+            by_day.setdefault(_day(entry["ts"]), []).append(json.dumps(entry) + "\n")
+        os.makedirs(self.directory, exist_ok=True)
+        for day, lines in by_day.items():
+            data = gzip.compress("".join(lines).encode("utf-8"), compresslevel=COMPRESS_LEVEL)
+            with open(self.path_for(day), "ab") as f:
+                f.write(data)
+            metrics.inc("archive_bytes_total", len(data))
+        metrics.inc("archive_records_total", len(buffer))
+        return len(buffer)
+
+    def days(self):
+        """Archived days (YYYY-MM-DD), oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name[len("responses-"):-len(".jsonl.gz")]
+            for name in os.listdir(self.directory)
+            if name.startswith("responses-") and name.endswith(".jsonl.gz")
+        )
+
+    def iter_records(self, since=None, until=None):
+        """
+        Yield (ts, source, url, body bytes) in archive order, optionally limited to the days
+        since..until (inclusive, YYYY-MM-DD). A member cut short by a crash ends that day's file.
+        """
+        for day in self.days():
+            if (since and day < since) or (until and day > until):
+                continue
+            path = self.path_for(day)
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        body = entry.get("body")
+                        body = body.encode("utf-8") if body is not None else base64.b64decode(entry["body_b64"])
+                        yield entry["ts"], entry["source"], entry["url"], body
+            except (EOFError, gzip.BadGzipFile, json.JSONDecodeError) as e:
+                logger.warning(f"Archive {path} is truncated or corrupt, skipping the rest: {e}")
@@ -0,0 +1,124 @@
+# src/bench_fixtures.py
+import html
+import json
+import os
+import random
+from xml.sax.saxutils import escape
+
+from utils import atomic_write
+
+FIXTURE_DIR = "src/data/bench/fixtures"
+SIZES = (100, 1000, 10_000, 50_000)
+
+# Vocabulary the generated postings are drawn from; roughly the mix seen on real boards
+_TITLES = [
+    "Software Engineering Intern", "Data Science Intern", "Machine Learning Co-op",
+    "Backend Developer Intern", "Frontend Engineering Internship", "Summer Analyst, Technology",
+    "Senior Software Engineer", "Staff Data Engineer", "Product Manager", "Site Reliability Engineer",
+    "Account Executive", "Engineering Manager", "New Grad Software Developer", "QA Automation Intern",
+]
+_TEAMS = ["Engineering", "Data", "Infrastructure", "Product", "Sales", "Research", "Security"]
+_LOCATIONS = ["Toronto, ON", "Vancouver, BC", "Montreal, QC", "Remote - Canada", "Waterloo, ON",
+              "New York, NY", "San Francisco, CA", "Halifax, NS"]
+_SKILLS = ["Python", "Java", "C++", "JavaScript", "TypeScript", "React", "Node.js", "SQL", "AWS",
+           "Docker", "Kubernetes", "TensorFlow", "PyTorch", "Go", "Rust", "Git", "Linux", "Spark"]
+_FILLER = (
+    "you will work with a collaborative team to design build and ship features used by millions "
+    "of customers across our platform while learning how we operate services at scale and "
+    "contributing to code reviews planning and testing in a fast paced environment with mentorship"
+).split()
+
+
+def _description(rng, words=80):
+    skills = rng.sample(_SKILLS, 4)
+    body = [rng.choice(_FILLER) for _ in range(words)]
+    for skill in skills:
+        body.insert(rng.randrange(len(body)), skill)
+    return " ".join(body).capitalize() + ". Requirements: " + ", ".join(skills) + "."
+
+def _postings(n, seed):
+    """n deterministic (title, team, location, description) tuples."""
+    rng = random.Random(seed)
+    return [(rng.choice(_TITLES), rng.choice(_TEAMS), rng.choice(_LOCATIONS), _description(rng))
+            for _ in range(n)]
+
+
+# --- Response bodies in each board's wire format ---
+def lever_payload(n, company="bench-lever"):
+    """Lever /v0/postings/<company>?mode=json body: a JSON list of postings."""
+    posts = [
+        {
+            "id": f"{company}-{i}",
+            "text": title,
+            "hostedUrl": f"https://jobs.lever.co/{company}/{i:08d}",
+            "categories": {"team": team, "location": location, "commitment": "Internship"},
+            "descriptionPlain": desc,
+            "createdAt": 1_700_000_000_000 + i,
+        }
+        for i, (title, team, location, desc) in enumerate(_postings(n, seed=f"lever:{n}"))
+    ]
+    return json.dumps(posts).encode("utf-8")
+
+def greenhouse_payload(n, company="bench-greenhouse"):
+    """Greenhouse /v1/boards/<company>/jobs body; content is HTML-escaped markup."""
+    jobs = [
+        {
+            "id": i,
+            "title": title,
+            "absolute_url": f"https://boards.greenhouse.io/{company}/jobs/{i}",
+            "location": {"name": location},
+            "content": html.escape(f"<div><h3>{team}</h3><p>{desc}</p></div>"),
+            "updated_at": "2024-01-01T00:00:00-05:00",
+        }
+        for i, (title, team, location, desc) in enumerate(_postings(n, seed=f"greenhouse:{n}"))
+    ]
+    return json.dumps({"jobs": jobs, "meta": {"total": n}}).encode("utf-8")
+
+def indeed_rss(n, query="computer+science+canada"):
+    """Indeed /rss?q=<query> body: an RSS 2.0 feed with HTML summaries."""
+    items = [
+        "<item>"
+        f"<title>{escape(title)} - {escape(location)}</title>"
+        f"<link>https://ca.indeed.com/viewjob?jk={i:016x}</link>"
+        f"<guid isPermaLink=\"false\">{i:016x}</guid>"
+        f"<description>{escape(f'<b>{team}</b><br>{desc}')}</description>"
+        "<pubDate>Mon, 01 Jan 2024 12:00:00 GMT</pubDate>"
+        "</item>"
+        for i, (title, team, location, desc) in enumerate(_postings(n, seed=f"indeed:{n}"))
+    ]
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Indeed jobs: {escape(query)}</title><link>https://ca.indeed.com/</link>"
+        + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+_BUILDERS = {
+    "lever": (lever_payload, "json"),
+    "greenhouse": (greenhouse_payload, "json"),
+    "indeed": (indeed_rss, "xml"),
+}
+
+def load_fixture(kind, n, fixture_dir=FIXTURE_DIR):
+    """Return the fixture body for a board kind and size, generating and saving it on first use."""
+    build, ext = _BUILDERS[kind]
+    path = os.path.join(fixture_dir, f"{kind}_{n}.{ext}")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    body = build(n)
+    atomic_write(path, body)
+    return body
+
+def sample_jobs(n, seed="jobs"):
+    """n job dicts shaped like the scraper's output, for stages that start after fetching."""
+    return [
+        {
+            "title": title,
+            "company": "Bench",
+            "link": f"https://example.com/jobs/{seed}/{i}",
+            "location": location,
+            "description": desc,
+            "source": "Bench",
+        }
+        for i, (title, team, location, desc) in enumerate(_postings(n, seed=f"{seed}:{n}"))
+    ]
@@ -0,0 +1,341 @@
+# src/benchmark.py
+"""
+Offline benchmark suite for the monitor's hot paths.
+
+Synthetic Lever, Greenhouse and Indeed responses, generated by bench_fixtures.py on first use
+into the gitignored src/data/bench/fixtures, are served by a local stub server, so every stage
+runs without network access. Results are written as JSON and compared against the baseline in
+src/bench_baseline.json, which is machine-local and must first be created with --save-baseline;
+the exit status is 1 when any stage regressed.
+
+    python src/benchmark.py                       # sizes 100, 1000, 10000
+    python src/benchmark.py --sizes 100 50000 --repeat 5
+    python src/benchmark.py --save-baseline       # accept the current numbers
+"""
+import argparse
+import asyncio
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Never reach out to the model hub; a model that is not cached locally is reported as skipped
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+import numpy as np
+
+import matcher
+import scraper
+from bench_fixtures import FIXTURE_DIR, load_fixture, sample_jobs
+from embedding_cache import EmbeddingCache
+from http_cache import ResponseCache
+from notifier import NotificationQueue
+from prefilter import SparsePrefilter
+from source_health import SourceHealth
+from storage import SeenStore
+from stub_server import StubBoardServer
+from utils import atomic_write_json, load_json
+
+RESULTS_FILE = "src/data/bench/results.json"
+BASELINE_FILE = "src/bench_baseline.json"
+DEFAULT_SIZES = (100, 1000, 10_000)
+REPEAT = 3
+REGRESSION_TOLERANCE = 0.25  # flag a stage that got more than 25% slower than its baseline
+NOISE_FLOOR_SECONDS = 0.005  # differences smaller than this are timer noise, never regressions
+MATCH_MAX_POSTINGS = 1000    # model inference is capped so large sizes finish in reasonable time
+MATCH_SINGLE_CALLS = 50      # hybrid_match_score is timed call by call on this many postings
+NOTIFY_MAX_ALERTS = 1000
+PREFILTER_CUTOFFS = (0.02, 0.05, 0.1, 0.15)  # recall/latency trade-off is reported at each
+ALERT_THRESHOLD = 70         # final score that would trigger an alert (config.json match_threshold)
+
+BENCH_RESUME = (
+    "Computer science student. Skills: Python, Java, SQL, React, Docker, AWS, Git. "
+    "Experience building REST APIs and data pipelines; projects in machine learning with PyTorch."
+)
+
+
+# --- Timing helpers ---
+def _best_of(run, repeat):
+    """Call run() repeat times; return (fastest wall time in seconds, value of the last call)."""
+    best, value = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        value = run()
+        best = min(best, time.perf_counter() - t0)
+    return best, value
+
+def _latencies(samples):
+    samples = np.asarray(samples) * 1000
+    return {"p50_ms": round(float(np.percentile(samples, 50)), 4),
+            "p95_ms": round(float(np.percentile(samples, 95)), 4)}
+
+def _result(seconds, items, **extra):
+    return {"seconds": round(seconds, 6), "items": items,
+            "per_sec": round(items / seconds, 1) if seconds else None, **extra}
+
+
+# --- Stages ---
+def bench_gather(n, fixtures, server, workdir, repeat):
+    """gather_all_jobs over one Lever board, one Greenhouse board and one Indeed feed of n postings each."""
+    server.add("/lever/bench-lever", fixtures["lever"])
+    server.add("/greenhouse/bench-greenhouse/jobs", fixtures["greenhouse"])
+    server.add("/indeed/rss", fixtures["indeed"], "application/rss+xml")
+    sources = scraper.build_sources(lever=["bench-lever"], greenhouse=["bench-greenhouse"],
+                                    indeed_queries=["bench"])
+    runs = iter(range(repeat))
+
+    def run():
+        # Fresh response cache and health file each run, so no body is skipped as unchanged
+        run_dir = os.path.join(workdir, f"gather_{n}_{next(runs)}")
+        scraper.response_cache = ResponseCache(os.path.join(run_dir, "http_cache"))
+        scraper.source_health = SourceHealth(os.path.join(run_dir, "source_health.json"))
+        return scraper._run(lambda s: scraper.gather_all_jobs_async(sources, s))
+
+    seconds, jobs = _best_of(run, repeat)
+    return {"gather_all_jobs": _result(seconds, 3 * n, kept=len(jobs))}
+
+def bench_keywords(n, repeat):
+    """is_internship_posting on the title + description of n postings, timed per call."""
+    texts = [job["title"] + " " + job["description"] for job in sample_jobs(n)]
+    samples = []
+
+    def run():
+        samples.clear()
+        for text in texts:
+            t0 = time.perf_counter()
+            scraper.is_internship_posting(text)
+            samples.append(time.perf_counter() - t0)
+
+    seconds, _ = _best_of(run, repeat)
+    return {"is_internship_posting": _result(seconds, n, **_latencies(samples))}
+
+def bench_match(n, workdir, repeat):
+    """hybrid_match_score per call and batch_match_scores on up to MATCH_MAX_POSTINGS postings."""
+    try:
+        model = matcher.get_model()
+        model.encode(["warm up"])
+    except Exception as e:
+        reason = f"model unavailable ({type(e).__name__}: {e})"
+        return {"hybrid_match_score": {"skipped": reason}, "batch_match_scores": {"skipped": reason}}
+
+    dim = model.get_sentence_embedding_dimension()
+    jobs = sample_jobs(min(n, MATCH_MAX_POSTINGS), seed="match")
+    texts = [job["title"] + " " + job["description"] for job in jobs]
+    skills = ["Python", "Java", "SQL", "React", "Docker", "AWS", "Git"]
+    runs = iter(range(2 * repeat))
+    samples = []
+
+    def cold_cache():
+        # Every run encodes from scratch rather than reading the previous run's embeddings
+        cache_dir = os.path.join(workdir, f"embeddings_{n}_{next(runs)}")
+        matcher._embedding_cache = EmbeddingCache(matcher.MODEL_NAME, dim, cache_dir=cache_dir)
+        matcher.resume_embedding.cache_clear()
+
+    def run_single():
+        cold_cache()
+        samples.clear()
+        for text in texts[:MATCH_SINGLE_CALLS]:
+            t0 = time.perf_counter()
+            matcher.hybrid_match_score(BENCH_RESUME, text, skills)
+            samples.append(time.perf_counter() - t0)
+
+    def run_batch():
+        cold_cache()
+        return matcher.batch_match_scores(BENCH_RESUME, texts, skills)
+
+    single_seconds, _ = _best_of(run_single, repeat)
+    batch_seconds, _ = _best_of(run_batch, repeat)
+    return {
+        "hybrid_match_score": _result(single_seconds, len(texts[:MATCH_SINGLE_CALLS]), **_latencies(samples)),
+        "batch_match_scores": _result(batch_seconds, len(texts)),
+    }
+
+def bench_prefilter(n, workdir, repeat):
+    """
+    Fit the TF-IDF prefilter on n postings and select candidates for one résumé. For each cutoff,
+    reports the share of postings passed on and, when the model is available, the recall of the
+    alerts full scoring would send plus the estimated two-stage time for the batch.
+    """
+    texts = [job["title"] + " " + job["description"] for job in sample_jobs(n, seed="prefilter")]
+    runs = iter(range(repeat))
+    SparsePrefilter(os.path.join(workdir, "prefilter_warmup.npz")).partial_fit(texts[:10])  # sklearn import
+    prefilter = None
+
+    def fit():
+        nonlocal prefilter
+        prefilter = SparsePrefilter(os.path.join(workdir, f"prefilter_{n}_{next(runs)}.npz"))
+        prefilter.partial_fit(texts)
+
+    fit_seconds, _ = _best_of(fit, repeat)
+    select_seconds, sims = _best_of(lambda: prefilter.scores(texts, [BENCH_RESUME])[:, 0], repeat)
+    pass_rate = {str(c): round(float(np.mean(sims >= c)), 4) for c in PREFILTER_CUTOFFS}
+    select = _result(select_seconds, n, pass_rate=pass_rate)
+
+    try:
+        matcher.get_model()
+    except Exception as e:
+        select["recall"] = f"skipped, model unavailable ({type(e).__name__})"
+    else:
+        m = min(n, MATCH_MAX_POSTINGS)
+        matcher._embedding_cache = EmbeddingCache(matcher.MODEL_NAME, matcher.get_model().get_sentence_embedding_dimension(),
+                                                  cache_dir=os.path.join(workdir, f"embeddings_prefilter_{n}"))
+        t0 = time.perf_counter()
+        final = np.asarray(matcher.batch_match_scores(BENCH_RESUME, texts[:m], ["Python", "Java", "SQL"]))
+        per_posting = (time.perf_counter() - t0) / m
+        alerts = final >= ALERT_THRESHOLD
+        select["alerts"] = int(alerts.sum())
+        select["recall"], select["est_two_stage_seconds"] = {}, {}
+        for c in PREFILTER_CUTOFFS:
+            kept = sims[:m] >= c
+            recall = float((alerts & kept).sum() / alerts.sum()) if alerts.any() else 1.0
+            select["recall"][str(c)] = round(recall, 4)
+            select["est_two_stage_seconds"][str(c)] = round(select_seconds + per_posting * n * pass_rate[str(c)], 4)
+        select["est_single_stage_seconds"] = round(per_posting * n, 4)
+    return {"prefilter_fit": _result(fit_seconds, n), "prefilter_select": select}
+
+def bench_seen_store(n, workdir, repeat):
+    """Stage and commit n links into a new store, then reopen it and look every link up."""
+    links = [job["link"] for job in sample_jobs(n, seed="seen")]
+    saves, loads = iter(range(repeat)), iter(range(repeat))
+
+    def save():
+        store = SeenStore(os.path.join(workdir, f"seen_{n}_{next(saves)}.db"))
+        for link in links:
+            store.add(link, score=50.0, source="Bench")
+        store.commit()
+        store.close()
+
+    def load():
+        store = SeenStore(os.path.join(workdir, f"seen_{n}_{next(loads)}.db"))
+        hits = sum(1 for link in links if link in store)
+        store.close()
+        return hits
+
+    save_seconds, _ = _best_of(save, repeat)
+    load_seconds, hits = _best_of(load, repeat)
+    return {
+        "seen_store_save": _result(save_seconds, n),
+        "seen_store_load": _result(load_seconds, n, hits=hits),
+    }
+
+def bench_notify(n, server, workdir, repeat):
+    """Batch and deliver up to NOTIFY_MAX_ALERTS alerts to the stub webhook."""
+    jobs = sample_jobs(min(n, NOTIFY_MAX_ALERTS), seed="notify")
+    runs = iter(range(repeat))
+
+    def run():
+        queue = NotificationQueue(server.url("/webhook"),
+                                  os.path.join(workdir, f"pending_{n}_{next(runs)}.json"))
+        for i, job in enumerate(jobs):
+            queue.enqueue(job, 80, user_id=str(100 + i % 4))
+
+        async def deliver():
+            try:
+                return await queue.flush()
+            finally:
+                await queue.close()
+
+        return asyncio.run(deliver())
+
+    seconds, (sent, pending) = _best_of(run, repeat)
+    return {"notification_dispatch": _result(seconds, len(jobs), messages=sent, undelivered=pending)}
+
+
+# --- Baseline comparison ---
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Annotate results with their baseline ratio; return the names of stages that regressed."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name, {})
+        if "seconds" not in current or "seconds" not in base or not base["seconds"]:
+            continue
+        ratio = current["seconds"] / base["seconds"]
+        current["baseline_seconds"] = base["seconds"]
+        current["ratio"] = round(ratio, 3)
+        if ratio > 1 + tolerance and current["seconds"] - base["seconds"] > NOISE_FLOOR_SECONDS:
+            regressions.append(name)
+    return regressions
+
+
+def run_suite(sizes, repeat=REPEAT, fixture_dir=FIXTURE_DIR):
+    """Run every stage at every size; returns {"<stage>[<size>]": metrics}."""
+    fixture_dir = os.path.abspath(fixture_dir)
+    results = {}
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="internscope-bench-") as workdir, StubBoardServer() as server:
+        # Anything that still uses a default "src/data/..." path lands in the scratch directory
+        os.chdir(workdir)
+        endpoints = (scraper.LEVER_API, scraper.GREENHOUSE_API, scraper.INDEED_RSS)
+        scraper.LEVER_API = server.url("/lever")
+        scraper.GREENHOUSE_API = server.url("/greenhouse")
+        scraper.INDEED_RSS = server.url("/indeed/rss")
+        try:
+            for n in sizes:
+                fixtures = {kind: load_fixture(kind, n, fixture_dir) for kind in ("lever", "greenhouse", "indeed")}
+                stages = {}
+                stages.update(bench_gather(n, fixtures, server, workdir, repeat))
+                stages.update(bench_keywords(n, repeat))
+                stages.update(bench_match(n, workdir, repeat))
+                stages.update(bench_prefilter(n, workdir, repeat))
+                stages.update(bench_seen_store(n, workdir, repeat))
+                stages.update(bench_notify(n, server, workdir, repeat))
+                for stage, metrics in stages.items():
+                    results[f"{stage}[{n}]"] = metrics
+                    print(f"{stage}[{n}]: {_describe(metrics)}", flush=True)
+        finally:
+            scraper.LEVER_API, scraper.GREENHOUSE_API, scraper.INDEED_RSS = endpoints
+            os.chdir(original_cwd)
+    return results
+
+def _describe(metrics):
+    if "skipped" in metrics:
+        return "skipped, " + metrics["skipped"]
+    text = f"{metrics['seconds'] * 1000:.1f} ms for {metrics['items']} ({metrics['per_sec']}/s)"
+    if "pass_rate" in metrics:
+        text += f", pass rate by cutoff {metrics['pass_rate']}, recall {metrics['recall']}"
+    if "p95_ms" in metrics:
+        text += f", p50 {metrics['p50_ms']} ms, p95 {metrics['p95_ms']} ms"
+    if "ratio" in metrics:
+        text += f", x{metrics['ratio']} vs baseline"
+    return text
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline InternScope benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="postings per synthetic fixture board, generated on first use (any size)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per stage; the fastest is kept")
+    parser.add_argument("--output", default=RESULTS_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+    output, baseline_path = os.path.abspath(args.output), os.path.abspath(args.baseline)
+
+    results = run_suite(args.sizes, args.repeat)
+    baseline = load_json(baseline_path)
+    regressions = compare(results, baseline["results"], args.tolerance) if baseline else []
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": args.sizes,
+        "repeat": args.repeat,
+        "results": results,
+        "regressions": regressions,
+    }
+    atomic_write_json(output, report, indent=2)
+    print(f"Results written to {output}")
+    if args.save_baseline:
+        atomic_write_json(baseline_path, report, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+    elif baseline is None:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to store one.")
+    for name in regressions:
+        print(f"REGRESSION {name}: {_describe(results[name])}")
+    return 1 if regressions and not args.save_baseline else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
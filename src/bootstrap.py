@@ -0,0 +1,191 @@
+# src/bootstrap.py
+"""
+Bulk bootstrap / backfill for a fresh deploy or a lost seen store.
+
+Fetches every configured source once, encodes all new postings on a pool of worker processes
+(one model copy per core), scores them against every profile in one matrix product, and writes
+the seen store, near-duplicate index, prefilter statistics and search index in bulk. Alerts are
+suppressed, reduced to a digest of each user's best matches, or all sent. Run from the repo root:
+
+    python src/bootstrap.py                         # digest: top matches per user
+    python src/bootstrap.py --notify none --workers 8
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from dedup import NearDuplicateIndex
+from embedding_cache import EmbeddingCache, CACHE_DIR
+from logger import setup_logger
+from matcher import MODEL_NAME, ENCODE_BATCH_SIZE, adjust_score_matrix
+from notifier import load_notification_queue
+from pipeline import make_encode_pool, encode_shard, encoder_dim
+from prefilter import load_prefilter, MIN_SIMILARITY
+from profiles import load_profiles
+from scraper import sources_from_config, gather_all_jobs_async, make_session, commit_responses, enable_archive, response_cache
+from storage import load_seen_jobs, save_seen_jobs, SEEN_TTL_DAYS
+from vector_index import load_job_index
+
+DIGEST_SIZE = 10       # best matches per user sent in digest mode (one webhook message each)
+SHARDS_PER_WORKER = 4  # smaller shards keep every worker busy until the end
+
+logger = setup_logger()
+
+
+def encode_all(texts, pool, workers, cache_dir=CACHE_DIR):
+    """
+    Embeddings for texts: cached ones from the embedding cache in cache_dir, the rest sharded
+    across the pool. The cache supports a single writer, so only one process may use a cache_dir.
+    """
+    dim = pool.submit(encoder_dim).result()
+    cache = EmbeddingCache(MODEL_NAME, dim, cache_dir)
+    vectors, missing = cache.lookup(texts)
+    if missing:
+        shard_size = max(ENCODE_BATCH_SIZE, math.ceil(len(missing) / (workers * SHARDS_PER_WORKER)))
+        shards = [[texts[i] for i in missing[start:start + shard_size]]
+                  for start in range(0, len(missing), shard_size)]
+        vectors[missing] = np.concatenate(list(pool.map(encode_shard, shards)))
+        cache.store([texts[i] for i in missing], vectors[missing])
+        cache.flush()
+    return vectors, len(texts) - len(missing)
+
+async def fetch_backlog(sources, is_seen):
+    async with make_session() as session:
+        return await gather_all_jobs_async(sources, session, is_seen)
+
+def run_bootstrap(config, notify="digest", workers=None):
+    """Ingest every unseen posting from the configured sources; returns a dict of counts and timings."""
+    stats = {}
+    t_start = time.perf_counter()
+    seen = load_seen_jobs()
+    sources = sources_from_config(config)
+    # The HTTP cache usually survives a lost seen store; treat every baseline as stale so unchanged
+    # boards are still fetched and parsed in full (and staged as the new baseline on commit)
+    response_cache.max_age = 0
+    if config.get("archive_responses", False):
+        enable_archive()
+
+    # 1. Fetch everything not already in the seen store (links repeated across sources kept once)
+    t0 = time.perf_counter()
+    jobs = list({job.link: job for job in asyncio.run(fetch_backlog(sources, seen.check))}.values())
+    stats["fetched"], stats["fetch_seconds"] = len(jobs), time.perf_counter() - t0
+    print(f"Fetched {len(jobs)} new postings from {len(sources)} sources in {stats['fetch_seconds']:.1f}s")
+
+    # 2. Collapse cross-source reposts, then drop postings no résumé overlaps with
+    near_dups = NearDuplicateIndex(seen)
+    jobs, dups = near_dups.filter(jobs)
+    for job, _ in dups:
+        seen.add(job.link, source=job.source)
+    stats["near_duplicates"] = len(dups)
+
+    profiles = load_profiles()
+    texts = [job.text for job in jobs]
+    prefilter_config = config.get("prefilter", {})
+    prefilter = load_prefilter() if prefilter_config.get("enabled", True) else None
+    if prefilter is not None and texts:
+        prefilter.partial_fit(texts)
+        resume_texts = [profile["text"] for profile in profiles.profiles.values()]
+        keep = prefilter.select(texts, resume_texts, prefilter_config.get("min_similarity", MIN_SIMILARITY),
+                                prefilter_config.get("top_k"))
+        kept = set(keep)
+        for i, job in enumerate(jobs):
+            if i not in kept:
+                seen.add(job.link, source=job.source)
+        stats["prefiltered"] = len(jobs) - len(keep)
+        jobs, texts = [jobs[i] for i in keep], [texts[i] for i in keep]
+
+    # 3. Encode postings (and any résumé still missing an embedding) across every core
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    vectors = None
+    missing_users = profiles.missing_embeddings()
+    with make_encode_pool(workers) as pool:
+        if missing_users:
+            user_vecs, _ = encode_all([profiles.get(uid)["text"] for uid in missing_users], pool, workers)
+            for uid, vec in zip(missing_users, user_vecs):
+                profiles.set_embedding(uid, vec)
+            profiles.save()
+        if texts:
+            vectors, stats["cached"] = encode_all(texts, pool, workers)
+    stats["encoded"], stats["encode_seconds"], stats["workers"] = len(texts), time.perf_counter() - t0, workers
+    if texts:
+        print(f"Encoded {len(texts)} postings ({stats['cached']} cached) on {workers} processes in "
+              f"{stats['encode_seconds']:.1f}s ({len(texts) / stats['encode_seconds']:.0f} postings/sec)")
+
+    # 4. Score every posting for every user in one product, then write everything in bulk
+    user_ids, resume_vecs, skill_sets = profiles.matrix()
+    alerts_by_user = {uid: [] for uid in user_ids}
+    scores = None
+    if texts and user_ids:
+        sem = np.round(vectors @ resume_vecs.T * 100, 2)
+        scores = adjust_score_matrix(sem, texts, skill_sets, [job.hits for job in jobs])
+    for row, job in enumerate(jobs):
+        best = None
+        if scores is not None:
+            best = float(scores[row].max())
+            for col, uid in enumerate(user_ids):
+                if scores[row, col] >= config["match_threshold"]:
+                    alerts_by_user[uid].append((float(scores[row, col]), job))
+        seen.add(job.link, score=best, source=job.source)
+
+    t0 = time.perf_counter()
+    save_seen_jobs(seen)
+    near_dups.commit(SEEN_TTL_DAYS)
+    if prefilter is not None:
+        prefilter.save()
+    if texts:
+        load_job_index().add(jobs, vectors)
+    commit_responses()
+    stats["write_seconds"] = time.perf_counter() - t0
+
+    # 5. Notifications: none, a digest of each user's best matches, or all of them
+    queue = load_notification_queue()
+    stats["matches"], stats["alerts_queued"] = 0, 0
+    for uid, found in alerts_by_user.items():
+        found.sort(key=lambda item: item[0], reverse=True)
+        send = found[:DIGEST_SIZE] if notify == "digest" else found if notify == "all" else []
+        for score, job in send:
+            queue.enqueue(job, score, uid)
+        stats["matches"] += len(found)
+        stats["alerts_queued"] += len(send)
+    if len(queue):
+        async def deliver():
+            try:
+                return await queue.flush()
+            finally:
+                await queue.close()
+        asyncio.run(deliver())
+
+    stats["total_seconds"] = time.perf_counter() - t_start
+    stats["postings_per_sec"] = stats["fetched"] / stats["total_seconds"] if stats["total_seconds"] else 0
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-ingest every configured job board.")
+    parser.add_argument("--notify", choices=("none", "digest", "all"), default="digest",
+                        help=f"alerts to send: none, each user's top {DIGEST_SIZE} (default), or all")
+    parser.add_argument("--workers", type=int, default=None, help="encoding processes (default: all cores)")
+    parser.add_argument("--config", default="src/config.json")
+    args = parser.parse_args(argv)
+    with open(args.config) as f:
+        config = json.load(f)
+
+    stats = run_bootstrap(config, args.notify, args.workers)
+    summary = (
+        f"Bootstrap: {stats['fetched']} postings in {stats['total_seconds']:.1f}s "
+        f"({stats['postings_per_sec']:.0f} postings/sec); {stats['near_duplicates']} near-duplicates, "
+        f"{stats.get('prefiltered', 0)} prefiltered, {stats['matches']} matches, "
+        f"{stats['alerts_queued']} alerts queued ({args.notify})"
+    )
+    logger.info(summary)
+    print(summary)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
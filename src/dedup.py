@@ -0,0 +1,161 @@
+# src/dedup.py
+import hashlib
+import re
+import time
+
+import numpy as np
+
+NUM_PERM = 96            # MinHash signature length
+BANDS = 32               # LSH bands of NUM_PERM // BANDS rows each
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.7  # estimated Jaccard at or above which two postings are the same
+# Different roles at one company share boilerplate, so titles must agree too: the share of the
+# shorter title's words found in the other (tolerates suffixes like " - Toronto, ON" on Indeed)
+TITLE_CONTAINMENT = 0.8
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+# Fixed multiply-shift hash family (seeded so signatures stay comparable across restarts)
+_rng = np.random.default_rng(0x1A7E5C09E)
+_A = _rng.integers(1, 1 << 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 1 << 63, size=NUM_PERM, dtype=np.uint64)
+
+
+def _words(text):
+    # Job fields are already unescaped and stripped of tags at ingestion
+    return _WORD_RE.findall(text.lower())
+
+def shingles(job):
+    """Title and company words plus description word unigrams and bigrams of a Job."""
+    desc = _words(job.description)
+    features = {"t:" + w for w in _words(job.title)}
+    features |= {"c:" + w for w in _words(job.company)}
+    features |= set(desc)
+    features |= {a + " " + b for a, b in zip(desc, desc[1:])}
+    return features
+
+def title_words(job):
+    """Normalized title words, sorted and space-joined (as stored next to each signature)."""
+    return " ".join(sorted(set(_words(job.title))))
+
+def titles_match(a, b):
+    """Whether two title_words() strings name the same role (see TITLE_CONTAINMENT)."""
+    words_a, words_b = set(a.split()), set(b.split())
+    if not words_a or not words_b:
+        return False
+    return len(words_a & words_b) / min(len(words_a), len(words_b)) >= TITLE_CONTAINMENT
+
+def minhash(job):
+    """MinHash signature (NUM_PERM uint32 values) of a posting, or None if it has no text."""
+    features = shingles(job)
+    if not features:
+        return None
+    digests = b"".join(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest() for f in features)
+    x = np.frombuffer(digests, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        hashed = (x[:, None] * _A + _B) >> np.uint64(32)  # features × NUM_PERM
+    return hashed.min(axis=0).astype(np.uint32)
+
+def _band_keys(sig):
+    """One 63-bit key per band (SQLite INTEGER is signed 64-bit)."""
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, "big") >> 1))
+    return keys
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of posting signatures, stored in the seen-jobs SQLite database.
+    A posting is looked up by its band keys; candidates that share a band and have a matching
+    title are confirmed by comparing full signatures, so each lookup touches only a handful of rows.
+    """
+
+    def __init__(self, store):
+        self.conn = store.conn
+        self._lock = store._lock
+        self._pending = []        # (link, signature, title words) added this cycle
+        self._pending_bands = {}  # (band, key) -> [(link, signature, title words)]
+        with self._lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS minhash ("
+                " link TEXT PRIMARY KEY, signature BLOB NOT NULL, first_seen REAL NOT NULL, title TEXT)"
+            )
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(minhash)")}
+            if "title" not in columns:  # older signatures have no title and never match again
+                self.conn.execute("ALTER TABLE minhash ADD COLUMN title TEXT")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS minhash_bands ("
+                " band INTEGER NOT NULL, key INTEGER NOT NULL, link TEXT NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS minhash_bands_key ON minhash_bands(band, key)")
+
+    def find(self, sig, title=""):
+        """Return the link of an earlier near-duplicate of this signature and title, or None."""
+        keys = _band_keys(sig)
+        candidates = {}
+        for key in keys:
+            for link, other, other_title in self._pending_bands.get(key, ()):
+                if link not in candidates and titles_match(title, other_title):
+                    candidates[link] = other
+        where = " OR ".join("(b.band = ? AND b.key = ?)" for _ in keys)
+        params = [x for key in keys for x in key]
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT DISTINCT m.link, m.signature, m.title FROM minhash_bands b"
+                f" JOIN minhash m ON m.link = b.link WHERE {where}", params
+            ).fetchall()
+        for link, blob, other_title in rows:
+            if link not in candidates and titles_match(title, other_title or ""):
+                candidates[link] = np.frombuffer(blob, dtype=np.uint32)
+        if not candidates:
+            return None
+        # Every candidate's estimated similarity in one comparison; the closest one wins
+        links = list(candidates)
+        sims = (np.stack(list(candidates.values())) == sig).mean(axis=1)
+        best = int(np.argmax(sims))
+        return links[best] if sims[best] >= SIMILARITY_THRESHOLD else None
+
+    def add(self, link, sig, title=""):
+        self._pending.append((link, sig, title))
+        for key in _band_keys(sig):
+            self._pending_bands.setdefault(key, []).append((link, sig, title))
+
+    def filter(self, jobs):
+        """
+        Split a batch into (unique jobs, [(duplicate job, link of the earlier copy)]).
+        Unique jobs are added to the index so later copies, even in the same batch, collapse onto them.
+        """
+        unique, duplicates = [], []
+        for job in jobs:
+            sig, title = minhash(job), title_words(job)
+            original = self.find(sig, title) if sig is not None else None
+            if original is not None and original != job["link"]:
+                duplicates.append((job, original))
+                continue
+            if sig is not None:
+                self.add(job["link"], sig, title)
+            unique.append(job)
+        return unique, duplicates
+
+    def commit(self, ttl_days=None):
+        """Persist signatures added this cycle; optionally forget ones older than ttl_days."""
+        pending, self._pending, self._pending_bands = self._pending, [], {}
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO minhash (link, signature, first_seen, title) VALUES (?, ?, ?, ?)",
+                [(link, sig.tobytes(), now, title) for link, sig, title in pending],
+            )
+            self.conn.executemany(
+                "INSERT INTO minhash_bands (band, key, link) VALUES (?, ?, ?)",
+                [(band, key, link) for link, sig, _ in pending for band, key in _band_keys(sig)],
+            )
+            if ttl_days is not None:
+                cutoff = now - ttl_days * 24 * 60 * 60
+                self.conn.execute(
+                    "DELETE FROM minhash_bands WHERE link IN (SELECT link FROM minhash WHERE first_seen < ?)",
+                    (cutoff,),
+                )
+                self.conn.execute("DELETE FROM minhash WHERE first_seen < ?", (cutoff,))
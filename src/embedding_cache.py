@@ -0,0 +1,142 @@
+# src/embedding_cache.py
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils import atomic_write_json, load_json
+
+CACHE_DIR = "src/data/embeddings"
+DEFAULT_CAPACITY = 50_000  # ~37 MB of float16 vectors at 384 dims
+
+logger = logging.getLogger("InternScope")
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially re-formatted postings share a cache entry."""
+    return " ".join(text.split())
+
+def text_key(text: str, model_name: str) -> str:
+    return hashlib.sha1(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+def _tag(key):
+    """64-bit tag of a key, stored next to its row (0 marks a row being written)."""
+    return int(key[:16], 16) or 1
+
+
+class EmbeddingCache:
+    """
+    On-disk, content-addressed store of text embeddings.
+    Vectors live in a memory-mapped float16 array; index.json maps each key to its row,
+    kept in least-recently-used order so the oldest rows are recycled when the store is full.
+    Each row also carries its key's tag in keys.u64, so an index left behind by a crash between
+    recycling a row and the next flush() cannot return another text's vector.
+    """
+
+    def __init__(self, model_name, dim, cache_dir=CACHE_DIR, capacity=DEFAULT_CAPACITY):
+        self.model_name = model_name
+        self.dim = dim
+        self.capacity = capacity
+        self.vectors_path = os.path.join(cache_dir, "vectors.f16")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.tags_path = os.path.join(cache_dir, "keys.u64")
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        self._slots = OrderedDict()  # key -> row, least recently used first
+        meta = None
+        if all(os.path.exists(path) for path in (self.index_path, self.vectors_path, self.tags_path)):
+            meta = load_json(self.index_path)
+
+        compatible = (
+            meta is not None
+            and meta.get("model") == self.model_name
+            and meta.get("dim") == self.dim
+            and meta.get("capacity") == self.capacity
+        )
+        if compatible:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="r+",
+                                      shape=(self.capacity, self.dim))
+            self._tags = np.memmap(self.tags_path, dtype=np.uint64, mode="r+", shape=(self.capacity,))
+            stale = 0
+            for key, row in meta.get("entries", []):
+                if int(self._tags[row]) == _tag(key):
+                    self._slots[key] = row
+                else:
+                    stale += 1
+            if stale:
+                logger.warning(f"Embedding cache: dropped {stale} entries whose rows were rewritten after the last flush.")
+                self._dirty = True
+        else:
+            if meta is not None:
+                logger.info("Embedding cache belongs to a different model/shape; starting fresh.")
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="w+",
+                                      shape=(self.capacity, self.dim))
+            self._tags = np.memmap(self.tags_path, dtype=np.uint64, mode="w+", shape=(self.capacity,))
+            self._dirty = True
+
+        used = set(self._slots.values())
+        self._free = [row for row in range(self.capacity - 1, -1, -1) if row not in used]
+
+    def __len__(self):
+        return len(self._slots)
+
+    def lookup(self, texts):
+        """
+        Return (vectors, missing): a float32 array with a row per text, filled where cached,
+        and the indexes of texts that still need to be encoded.
+        """
+        keys = [text_key(t, self.model_name) for t in texts]
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                row = self._slots.get(key)
+                if row is None:
+                    missing.append(i)
+                    continue
+                self._slots.move_to_end(key)
+                out[i] = self._vectors[row]
+            if len(missing) < len(texts):
+                self._dirty = True  # LRU order changed
+        return out, missing
+
+    def store(self, texts, vectors):
+        """Add freshly computed embeddings, evicting least recently used rows when full."""
+        with self._lock:
+            for text, vec in zip(texts, vectors):
+                key = text_key(text, self.model_name)
+                row = self._slots.get(key)
+                if row is None:
+                    if not self._free:
+                        _, evicted = self._slots.popitem(last=False)
+                        self._free.append(evicted)
+                    row = self._free.pop()
+                # Invalidate the row before rewriting it; the index on disk may still point here
+                self._tags[row] = 0
+                self._vectors[row] = vec
+                self._tags[row] = _tag(key)
+                self._slots[key] = row
+                self._slots.move_to_end(key)
+            self._dirty = True
+
+    def flush(self):
+        """Persist vectors and the index; the index is replaced atomically."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._vectors.flush()
+            self._tags.flush()
+            meta = {
+                "model": self.model_name,
+                "dim": self.dim,
+                "capacity": self.capacity,
+                "entries": list(self._slots.items()),
+            }
+            atomic_write_json(self.index_path, meta)
+            self._dirty = False
@@ -0,0 +1,91 @@
+# src/http_cache.py
+import hashlib
+import os
+import threading
+import time
+
+from utils import atomic_write_json, load_json
+
+CACHE_DIR = "src/data/http_cache"
+# A baseline older than this is ignored, so even a board whose body never changes is parsed
+# again periodically and its postings' last_seen times stay well inside the seen-store TTL
+MAX_BASELINE_AGE_SECONDS = 30 * 24 * 60 * 60
+
+
+class ResponseCache:
+    """
+    Per-URL store of HTTP validators (ETag / Last-Modified), body hashes and bodies.
+    New responses are staged with update() and only become the baseline on commit(),
+    so a cycle that fails before its postings are processed re-downloads them next time.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_age=MAX_BASELINE_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._pending = {}
+
+    def _load(self):
+        return load_json(self.index_path, {})
+
+    def _body_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".body")
+
+    def _baseline(self, url):
+        """The committed entry for a URL, or {} when there is none or it is older than max_age."""
+        entry = self._entries.get(url, {})
+        if time.time() - entry.get("committed_at", 0) > self.max_age:
+            return {}
+        return entry
+
+    def validators(self, url):
+        """Conditional-request headers for the last committed response of this URL."""
+        entry = self._baseline(url)
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def body(self, url):
+        """Return the last committed body for a URL (used after a 304), or None."""
+        try:
+            with open(self._body_path(url), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def update(self, url, headers, body):
+        """Stage a fresh 200 response; returns False when the body is identical to the committed one."""
+        body_hash = hashlib.sha256(body).hexdigest()
+        entry = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "body_hash": body_hash,
+        }
+        with self._lock:
+            self._pending[url] = (entry, body)
+        return self._baseline(url).get("body_hash") != body_hash
+
+    def commit(self):
+        """Make staged responses the new baseline and persist them."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            now = time.time()
+            for url, (entry, body) in pending.items():
+                baseline = self._baseline(url)
+                if baseline.get("body_hash") == entry["body_hash"]:
+                    # Same body as a baseline that is still fresh: refresh the validators but keep
+                    # its age, so a board that never changes is still parsed again after max_age
+                    self._entries[url] = dict(entry, committed_at=baseline["committed_at"])
+                    continue
+                with open(self._body_path(url), "wb") as f:
+                    f.write(body)
+                self._entries[url] = dict(entry, committed_at=now)
+            atomic_write_json(self.index_path, self._entries)
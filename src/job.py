@@ -0,0 +1,108 @@
+# src/job.py
+import html
+import re
+import sys
+
+from keywords import scan, KEYWORDS
+
+# Roughly MiniLM's 256-token window; anything past it would be cut off by the tokenizer anyway
+MAX_DESCRIPTION_CHARS = 1500
+FIELDS = ("title", "company", "link", "location", "description", "source")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def clean_text(text):
+    """Unescape HTML (twice: Greenhouse content is escaped markup), drop tags, collapse whitespace."""
+    if not text:
+        return ""
+    text = html.unescape(text)
+    if "<" in text:
+        text = html.unescape(_TAG_RE.sub(" ", text))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+class Job:
+    """
+    One normalized posting. HTML is stripped, whitespace collapsed and the description truncated
+    once, at ingestion; keyword hits are computed on the full text at the same time (so skills
+    listed past the truncation point still count). Company, location and source strings repeat
+    across thousands of postings and are interned. Supports job["title"] / job.get("title") so
+    code written against the old posting dicts keeps working.
+    """
+
+    __slots__ = ("title", "company", "link", "location", "description", "source", "_text", "_lower", "_hits")
+
+    def __init__(self, title, company, link, location="", description="", source="", extra=""):
+        """extra: text that only takes part in keyword matching (e.g. a Lever team name)."""
+        self.title = clean_text(title)
+        self.company = sys.intern(company or "")
+        self.link = link
+        self.location = sys.intern(clean_text(location))
+        description = clean_text(description)
+        self.description = description[:MAX_DESCRIPTION_CHARS]
+        self.source = sys.intern(source)
+        self._text = self._lower = None
+        self._hits = scan(f"{self.title} {description} {extra}")
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a record that was already normalized (e.g. from the search index on disk).
+        Keyword hits saved by to_dict() are restored as-is: they were computed on the full
+        description, which the stored one is a truncated copy of.
+        """
+        job = cls.__new__(cls)
+        job.title = data.get("title", "")
+        job.company = sys.intern(data.get("company", ""))
+        job.link = data.get("link")
+        job.location = sys.intern(data.get("location", ""))
+        job.description = data.get("description", "")
+        job.source = sys.intern(data.get("source", ""))
+        job._text = job._lower = job._hits = None
+        if "hits" in data:
+            job._hits = {category: set(data["hits"].get(category, ())) for category in KEYWORDS.categories}
+        return job
+
+    def to_dict(self):
+        """The fields plus keyword hits (non-empty categories only), JSON-ready."""
+        data = {field: getattr(self, field) for field in FIELDS}
+        data["hits"] = {category: sorted(words) for category, words in self.hits.items() if words}
+        return data
+
+    @property
+    def text(self):
+        """Title and description, the text that is embedded and scored."""
+        if self._text is None:
+            self._text = f"{self.title} {self.description}"
+        return self._text
+
+    @property
+    def lower(self):
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def hits(self):
+        """Keyword hits by category (see keywords.scan)."""
+        if self._hits is None:
+            self._hits = scan(self.text)
+        return self._hits
+
+    @property
+    def is_internship(self):
+        return bool(self.hits["internship"])
+
+    # --- Mapping-style access ---
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in FIELDS else default
+
+    def __repr__(self):
+        return f"Job({self.title!r}, {self.company!r}, {self.link!r})"
@@ -0,0 +1,83 @@
+# src/keywords.py
+import re
+
+# --- Keyword lists by category (matched case-insensitively on word boundaries) ---
+INTERNSHIP_KEYWORDS = [
+    "intern", "internship", "co-op", "co op", "coop",
+    "student", "work term","work-term","workterm", "placement",
+    "undergraduate", "Software", "Developer","jr", "junior",
+    "Computer Science","Computer-Science","CS","datascience",
+    "Data science","Data-science","tech","Python", "Java","C++", "C#",
+    "react", "git", "machine learning", "artificial intelligence", "AI",
+    "cloud", "aws", "azure", "docker", "git-hub", "github"
+]
+
+SKILL_KEYWORDS = [
+    "python","java","c++","c","sql","javascript","typescript","react","node","flask",
+    "django","html","css","pandas","numpy","tensorflow","pytorch",
+    "machine learning","deep learning","ai","cloud","aws","azure","docker","git"
+]
+
+SENIOR_TERMS = ["senior", "lead", "manager", "director", "principal"]
+
+RESUME_SECTION_KEYWORDS = ["experience", "education", "skills", "projects", "contact", "summary"]
+
+# Shown by /analyze_resume as found / missing
+CORE_SKILL_KEYWORDS = ["python", "java", "sql", "data", "machine learning", "flask", "react"]
+
+# A keyword only counts when it is not glued to letters, digits, '+' or '#'
+# (so "c" does not match inside "c++" and "git" does not match inside "digital").
+_WORD = r"[\w+#]"
+
+
+class KeywordMatcher:
+    """
+    Finds every keyword of every category in a single regex pass over the text.
+    All keywords are compiled into one case-insensitive alternation, tried at each word start;
+    keywords that are a prefix of a longer match (e.g. "data" in "data science") are added too.
+    A keyword may be followed by a plural "s" ("internships", "students" match "internship", "student").
+    """
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self._by_keyword = {}  # casefolded keyword -> set of categories
+        for category, words in categories.items():
+            for word in words:
+                self._by_keyword.setdefault(word.casefold(), set()).add(category)
+
+        keywords = sorted(self._by_keyword, key=len, reverse=True)  # longest alternative wins
+        self._prefixes = {
+            kw: [other for other in keywords
+                 if other != kw and kw.startswith(other) and not re.match(_WORD, kw[len(other)])]
+            for kw in keywords
+        }
+        alternation = "|".join(re.escape(kw) for kw in keywords)
+        self._pattern = re.compile(
+            rf"(?<!{_WORD})(?=({alternation})s?(?!{_WORD}))",
+            re.IGNORECASE,
+        )
+
+    def scan(self, text):
+        """Return {category: set of matched keywords (casefolded)} for every category."""
+        hits = {category: set() for category in self.categories}
+        if not text:
+            return hits
+        for match in self._pattern.finditer(text):
+            found = match.group(1).casefold()
+            for kw in (found, *self._prefixes.get(found, ())):
+                for category in self._by_keyword[kw]:
+                    hits[category].add(kw)
+        return hits
+
+
+KEYWORDS = KeywordMatcher({
+    "internship": INTERNSHIP_KEYWORDS,
+    "skill": SKILL_KEYWORDS,
+    "seniority": SENIOR_TERMS,
+    "resume_section": RESUME_SECTION_KEYWORDS,
+    "core_skill": CORE_SKILL_KEYWORDS,
+})
+
+def scan(text):
+    """One pass over text with the shared matcher; returns hits by category."""
+    return KEYWORDS.scan(text)
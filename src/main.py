@@ -1,18 +1,29 @@
-import os
 import time
-import fitz 
+STARTUP_T0 = time.perf_counter()  # measured before the remaining imports
+
+import os
+import asyncio
 import json
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
 from storage import load_seen_jobs
-from storage import save_seen_jobs
-from scraper import gather_all_jobs, fetch_indeed_query
-from matcher import hybrid_match_score
-from notifier import notify_discord
-from resume_handler import get_resume_text, is_resume_text, extract_resume_skills
+from storage import save_seen_jobs, SEEN_TTL_DAYS
+from dedup import NearDuplicateIndex
+from prefilter import load_prefilter, MIN_SIMILARITY
+from scraper import stream_new_jobs, sources_from_config, commit_responses, health_report, enable_archive, close_session, source_health as fetch_health
+from scheduler import PollScheduler
+from search import normalize_query, search_jobs, search_sources, QueryCache, SEARCH_TIMEOUT_SECONDS, PARTIAL_TTL_SECONDS
+from pipeline import run_io, run_cpu, score_jobs, score_jobs_for_users, embed_text, load_model, drain_metrics, shutdown as shutdown_pools
+from matcher import apply_adjustments
+from vector_index import load_job_index
+from profiles import load_profiles, resume_path, RESUME_DIR, DEFAULT_USER
+from notifier import load_notification_queue
+from resume_handler import get_resume_text, get_resume_artifacts, extract_resume_skills, resume_cache
 from logger import setup_logger
+from metrics import metrics, profiled, METRICS_FILE, PROFILE_REPORT
+from keywords import scan, CORE_SKILL_KEYWORDS
 
 
 # --- Load configuration ---
@@ -22,9 +33,36 @@ with open("src/config.json") as f:
     CONFIG = json.load(f)
 
 COMPANIES = CONFIG["companies"]
-CHECK_INTERVAL_HOURS = CONFIG["check_interval_hours"]
+CHECK_INTERVAL_HOURS = CONFIG["check_interval_hours"]  # starting poll interval for a new source
+POLLING = CONFIG.get("polling", {})
+POLL_TICK_MINUTES = POLLING.get("tick_minutes", 5)  # how often the loop checks which sources are due
 MATCH_THRESHOLD = CONFIG["match_threshold"]
 DEBUG_MODE = CONFIG["debug_mode"]
+WARM_UP_MODEL = CONFIG.get("warm_up_model", True)
+PROFILE_FIRST_CYCLE = CONFIG.get("profile_cycle", False)  # cProfile the first monitor cycle
+PREFILTER = CONFIG.get("prefilter", {})  # cheap TF-IDF stage before the embedding model
+PREFILTER_ENABLED = PREFILTER.get("enabled", True)
+FIND_JOBS_CANDIDATES = 20  # indexed postings re-ranked with the skill boost / senior penalty
+FIND_JOBS_RESULTS = 5      # matches shown per query
+FIND_JOBS_EDIT_INTERVAL = 1.5  # seconds between partial-result edits (Discord rate-limits edits)
+SEARCH = CONFIG.get("search", {})  # live /find_jobs fan-out: per-source timeout and result cache
+
+# --- Sources and their adaptive polling schedule ---
+SOURCES = sources_from_config(CONFIG)
+poll_scheduler = PollScheduler(
+    min_interval=POLLING.get("min_interval_minutes", 15) * 60,
+    max_interval=POLLING.get("max_interval_hours", 12) * 60 * 60,
+    initial_interval=CHECK_INTERVAL_HOURS * 60 * 60,
+    jitter=POLLING.get("jitter", 0.1),
+)
+poll_scheduler.forget([name for name, _ in SOURCES])
+if CONFIG.get("archive_responses", False):
+    enable_archive()  # raw responses kept for offline re-scoring with replay.py
+
+# --- /find_jobs result caches ---
+# Live postings matching a query are shared by every user; ranked matches are per user and résumé
+search_cache = QueryCache(SEARCH.get("cache_ttl_minutes", 15) * 60, SEARCH.get("cache_size", 256))
+find_jobs_cache = QueryCache(SEARCH.get("cache_ttl_minutes", 15) * 60, SEARCH.get("cache_size", 256))
 
 # --- Load token from .env file ---
 load_dotenv()
@@ -33,18 +71,51 @@ TOKEN = os.getenv("DISCORD_TOKEN")
 # --- Discord intents configuration ---
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
 
-# Global variable to hold uploaded resume text
-resume_text = ""
-
-# --- Function: Extract text from PDF ---
-def extract_text_from_pdf(file_path):
-    text = ""
-    with fitz.open(file_path) as pdf:
-        for page in pdf:
-            text += page.get_text()
-    return text
+class InternScopeBot(commands.Bot):
+    async def close(self):
+        """Stop the monitor and close the shared HTTP sessions while the event loop is still running."""
+        job_monitor.cancel()
+        await close_session()
+        await load_notification_queue().close()
+        await super().close()
+
+bot = InternScopeBot(command_prefix="!", intents=intents)
+
+# Held for the duration of a monitor cycle so a slow cycle never overlaps the next tick
+monitor_lock = asyncio.Lock()
+profile_next_cycle = PROFILE_FIRST_CYCLE  # set by /stats to cProfile a single cycle
+index_pruned = False  # the search index is checked against the seen store once at startup
+
+# --- Function: store a user's résumé profile (text, skills, embedding) ---
+async def save_profile(user_id, artifacts, file_path):
+    """Store a user's profile from cached résumé artifacts, embedding the résumé only once per file."""
+    embedding = artifacts["embedding"]
+    if embedding is None:
+        embedding = await run_cpu(embed_text, artifacts["text"])
+        await run_io(resume_cache.set_embedding, artifacts["sha"], embedding)
+    profiles = await run_io(load_profiles)
+    profiles.remove(DEFAULT_USER)  # the sample résumé only stands in until someone uploads their own
+    profiles.set_profile(user_id, artifacts["text"], artifacts["skills"], file_path, embedding)
+    await run_io(profiles.save)
+
+async def load_scoring_profiles():
+    """
+    Return the profile store with every résumé embedded. While no one has uploaded a résumé,
+    the legacy single résumé in src/data stands in as the default profile; it is kept in memory
+    only (ProfileStore never saves it) and is dropped when the first real profile is saved.
+    """
+    profiles = await run_io(load_profiles)
+    if not len(profiles):
+        legacy_text = await run_io(get_resume_text)
+        if legacy_text:
+            profiles.set_profile(DEFAULT_USER, legacy_text, extract_resume_skills(legacy_text), None)
+    missing = profiles.missing_embeddings()
+    for user_id in missing:
+        profiles.set_embedding(user_id, await run_cpu(embed_text, profiles.get(user_id)["text"]))
+    if missing:
+        await run_io(profiles.save)
+    return profiles
 
 # --- Slash command: upload resume ---
 @bot.tree.command(name="upload_resume", description="Upload your resume PDF for analysis.")
@@ -65,25 +136,28 @@ async def upload_resume(interaction: discord.Interaction):
             await interaction.followup.send("Please upload a `.pdf` file.")
             return
 
-        # 2. Save the uploaded PDF
-        os.makedirs("src/data", exist_ok=True)
-        file_path = f"src/data/{attachment.filename}"
+        # 2. Save the uploaded PDF (one résumé per Discord user)
+        user_id = str(interaction.user.id)
+        os.makedirs(RESUME_DIR, exist_ok=True)
+        file_path = resume_path(user_id)
         await attachment.save(file_path)
 
-        # 3. Extract text
-        global resume_text
-        resume_text = extract_text_from_pdf(file_path)
-        RESUME_SKILLS = extract_resume_skills(resume_text)
+        # 3. Extract text and skills (cached by file hash)
+        artifacts = await run_io(get_resume_artifacts, file_path)
 
         # 4. Validate the file content (using is_resume_text)
-        if not is_resume_text(resume_text):
+        if not artifacts["is_resume"]:
             os.remove(file_path)  # delete invalid file
+            await run_io(resume_cache.forget, file_path)
             await interaction.followup.send(
                 "This file doesn’t appear to be a résumé. Please upload your actual résumé PDF."
             )
             return
 
-        # 5. Confirm success
+        # 5. Store text, skills and embedding as this user's profile
+        await save_profile(user_id, artifacts, file_path)
+
+        # 6. Confirm success
         await interaction.followup.send(f"Resume `{attachment.filename}` uploaded successfully!")
 
     except Exception as e:
@@ -93,15 +167,15 @@ async def upload_resume(interaction: discord.Interaction):
 # --- Slash command: analyze resume ---
 @bot.tree.command(name="analyze_resume", description="Analyze your uploaded resume for key skills.")
 async def analyze_resume(interaction: discord.Interaction):
-    global resume_text
-    if not resume_text:
+    profile = (await run_io(load_profiles)).get(interaction.user.id)
+    if not profile:
         await interaction.response.send_message(" No resume uploaded yet. Use `/upload_resume` first.")
         return
 
     # Basic keyword-based check
-    keywords = ["python", "java", "sql", "data", "machine learning", "flask", "react"]
-    strengths = [kw for kw in keywords if kw in resume_text.lower()]
-    missing = [kw for kw in keywords if kw not in strengths]
+    found = scan(profile["text"])["core_skill"]
+    strengths = [kw for kw in CORE_SKILL_KEYWORDS if kw in found]
+    missing = [kw for kw in CORE_SKILL_KEYWORDS if kw not in found]
 
     feedback = (
         f"**Found skills:** {', '.join(strengths) or 'None detected'}\n"
@@ -128,32 +202,31 @@ async def update_resume(interaction: discord.Interaction):
             await interaction.followup.send("⚠️ Please upload a `.pdf` file.")
             return
 
-        os.makedirs("src/data", exist_ok=True)
-        file_path = f"src/data/{attachment.filename}"
+        user_id = str(interaction.user.id)
+        os.makedirs(RESUME_DIR, exist_ok=True)
+        file_path = resume_path(user_id)
 
         #2. Delete old resume if it exists
-        old_files = [f for f in os.listdir("src/data") if f.lower().endswith(".pdf")]
-        for f in old_files:
-            os.remove(os.path.join("src/data", f))
+        if os.path.exists(file_path):
+            os.remove(file_path)
 
         #3. Save new file
         await attachment.save(file_path)
 
-        #4. Extract text
-        text = extract_text_from_pdf(file_path)
+        #4. Extract text, skills and validation in one pass (cached by file hash)
+        artifacts = await run_io(get_resume_artifacts, file_path)
 
         #5. Validate résumé content
-        if not is_resume_text(text):
+        if not artifacts["is_resume"]:
             os.remove(file_path)
+            await run_io(resume_cache.forget, file_path)
             await interaction.followup.send(
                 "This file doesn’t appear to be a résumé. Please upload your actual résumé PDF."
             )
             return
 
-        #6. Update global résumé text
-        global resume_text, RESUME_SKILLS
-        resume_text = extract_text_from_pdf(file_path)
-        RESUME_SKILLS = extract_resume_skills(resume_text)
+        #6. Update this user's profile
+        await save_profile(user_id, artifacts, file_path)
 
         # 7. Confirm success
         await interaction.followup.send(
@@ -167,38 +240,151 @@ async def update_resume(interaction: discord.Interaction):
 # --- Slash command: delete resume ---
 @bot.tree.command(name="delete_resume", description="Delete your uploaded resume.")
 async def delete_resume(interaction: discord.Interaction):
-    deleted = False
-    if os.path.exists("src/data"):
-        for f in os.listdir("src/data"):
-            if f.lower().endswith(".pdf"):
-                os.remove(os.path.join("src/data", f))
-                deleted = True
-
-    global resume_text
-    resume_text = ""
+    profiles = await run_io(load_profiles)
+    removed = profiles.remove(interaction.user.id)
+    deleted = removed is not None
+    if deleted:
+        await run_io(profiles.save)
+    file_path = resume_path(interaction.user.id)
+    if os.path.exists(file_path):
+        os.remove(file_path)
+        await run_io(resume_cache.forget, file_path)
+        deleted = True
+
     msg = "Your resume has been deleted." if deleted else " No resume found to delete."
     await interaction.response.send_message(msg)
 
-@tasks.loop(hours=CHECK_INTERVAL_HOURS)
+@tasks.loop(minutes=POLL_TICK_MINUTES)
 async def job_monitor():
-    logger.info("Running scheduled job check...")
-    seen = load_seen_jobs()
-    resume_text = get_resume_text()
-    jobs = gather_all_jobs()
-    new_seen = set(seen)
-
-    for job in jobs:
-        if job['link'] not in seen:
-            desc = job.get("description", "")
-            score = hybrid_match_score(resume_text, job["title"] + " " + desc, RESUME_SKILLS)
-            if score >= MATCH_THRESHOLD:
-                notify_discord(job, score)
-                logger.info(f"New job found: {job['title']} ({score}%)")
-            
-            new_seen.add(job["link"])
-
-    save_seen_jobs(new_seen)
-    print("Job check complete.")
+    if monitor_lock.locked():
+        logger.warning("Previous job check is still running; skipping this tick.")
+        return
+    # Only sources whose adaptive next-due time has passed (and that aren't backing off) are polled
+    due_names = {name for name in poll_scheduler.due([name for name, _ in SOURCES])
+                 if fetch_health.should_fetch(name)}
+    if not due_names:
+        return
+    global profile_next_cycle
+    async with monitor_lock:
+        profile, profile_next_cycle = profile_next_cycle, False
+        with profiled(profile):
+            await run_monitor_cycle([(name, fetch) for name, fetch in SOURCES if name in due_names])
+        if profile:
+            logger.info(f"Cycle profile written to {PROFILE_REPORT}")
+
+async def run_monitor_cycle(sources=None):
+    """
+    One monitor cycle over the given (due) sources, all configured sources by default.
+    Blocking stages run in the worker pools; the event loop only awaits.
+    """
+    global index_pruned
+    sources = SOURCES if sources is None else sources
+    logger.info(f"Running scheduled job check of {len(sources)}/{len(SOURCES)} due sources...")
+    cycle_t0 = time.perf_counter()
+    seen = await run_io(load_seen_jobs)
+    profiles = await load_scoring_profiles()
+    user_ids, resume_vecs, skill_sets = profiles.matrix()
+    alerts = load_notification_queue()
+    index = await run_io(load_job_index)
+    near_dups = await run_io(NearDuplicateIndex, seen)
+    prefilter = await run_io(load_prefilter) if PREFILTER_ENABLED else None
+    resume_texts = [profiles.get(uid)["text"] for uid in user_ids]
+
+    # Stream unseen postings from every source (dedup on the link before any description work),
+    # collapse cross-source reposts of the same posting, and score each batch against every
+    # user's résumé in one jobs × users matrix
+    new_count = dup_count = 0
+    new_counts = {}
+    async for batch in stream_new_jobs(sources, is_seen=seen.check, new_counts=new_counts):
+        batch, dups = await run_io(near_dups.filter, batch)
+        for job, original in dups:
+            seen.add(job.link, source=job.source)
+            if DEBUG_MODE:
+                logger.debug(f"Near-duplicate of {original}: {job['title']} ({job['source']})")
+        dup_count += len(dups)
+        metrics.inc("postings_deduped_total", len(dups), stage="near_duplicate")
+        if not batch:
+            continue
+
+        texts = [job.text for job in batch]
+
+        # Postings with no lexical overlap with any résumé never reach the transformer
+        if prefilter is not None:
+            with metrics.timer("prefilter_seconds"):
+                await run_io(prefilter.partial_fit, texts)
+                keep = await run_io(prefilter.select, texts, resume_texts,
+                                    PREFILTER.get("min_similarity", MIN_SIMILARITY), PREFILTER.get("top_k"))
+            kept = set(keep)
+            for i, job in enumerate(batch):
+                if i not in kept:
+                    seen.add(job.link, source=job.source)
+            metrics.inc("postings_prefiltered_total", len(batch) - len(keep))
+            batch, texts = [batch[i] for i in keep], [texts[i] for i in keep]
+            if not batch:
+                continue
+
+        with metrics.timer("score_seconds"):
+            scores, vectors = await run_cpu(score_jobs_for_users, texts, resume_vecs, skill_sets,
+                                            [job.hits for job in batch])
+        metrics.observe("score_batch_size", len(batch))
+        metrics.inc("postings_scored_total", len(batch))
+
+        for row, job in enumerate(batch):
+            best = None
+            for col, user_id in enumerate(user_ids):
+                score = float(scores[row, col])
+                best = score if best is None else max(best, score)
+                if score >= MATCH_THRESHOLD:
+                    alerts.enqueue(job, score, user_id)
+                    logger.info(f"New job found for {user_id}: {job['title']} ({score}%)")
+
+            seen.add(job.link, score=best, source=job.source)
+
+        if vectors is not None:
+            await run_io(index.add, batch, vectors)
+        new_count += len(batch)
+
+        # Alerts go out as each batch is scored, packed up to 10 embeds per message
+        if len(alerts):
+            await alerts.flush()
+
+    # Anything undelivered stays persisted and is retried next cycle
+    if len(alerts):
+        logger.info(f"{len(alerts)} alerts still pending delivery.")
+    expired = await run_io(save_seen_jobs, seen)  # one transaction for all new links
+    if expired or not index_pruned:
+        # Postings that dropped out of the seen store have closed; stop returning them in /find_jobs
+        pruned = await run_io(index.prune, set(seen))
+        index_pruned = True
+        if pruned:
+            logger.info(f"Pruned {pruned} expired postings from the search index.")
+    await run_io(near_dups.commit, SEEN_TTL_DAYS)
+    if prefilter is not None:
+        await run_io(prefilter.save)
+    logger.info(f"Processed {new_count} new postings, collapsed {dup_count} near-duplicates "
+                f"({len(index)} searchable).")
+    await run_io(commit_responses)  # unchanged boards are skipped from the next cycle on
+
+    # Each polled source is rescheduled by how many new postings it has been producing
+    for name, count in new_counts.items():
+        poll_scheduler.record(name, count)
+    await run_io(poll_scheduler.save)
+    next_in = max(poll_scheduler.next_due([name for name, _ in SOURCES]) - time.time(), 0)
+    logger.info(f"Polled {len(new_counts)} sources; next source due in {next_in / 60:.0f} min.")
+    unhealthy = health_report()
+    if unhealthy:
+        logger.info(f"{len(unhealthy)} sources quarantined or backing off:\n" + "\n".join(unhealthy))
+
+    # Encode timings are recorded in the scoring worker; fold them into this process's registry
+    if new_count:
+        metrics.merge(await run_cpu(drain_metrics))
+    elapsed = time.perf_counter() - cycle_t0
+    metrics.observe("cycle_seconds", elapsed)
+    metrics.set("cycle_new_postings", new_count)
+    metrics.set("cycle_near_duplicates", dup_count)
+    metrics.set("cycle_completed_timestamp", time.time())
+    await run_io(metrics.write_prometheus)
+    logger.info(f"Job check complete in {elapsed:.1f}s.")
 
 @bot.tree.command(name="send_test_alert", description="Send a test job alert to verify Discord notifications.")
 async def send_test_alert(interaction: discord.Interaction):
@@ -210,38 +396,217 @@ async def send_test_alert(interaction: discord.Interaction):
         "description": "This is a test alert to confirm Discord integration.",
         "source": "Manual Test"
     }
-    notify_discord(fake_job, 95)
-    await interaction.response.send_message("✅ Test alert sent! Check your Discord channel.")
+    # Answer within Discord's 3s deadline first: the flush may wait for a running cycle and retries
+    await interaction.response.defer(thinking=True)
+    alerts = load_notification_queue()
+    alerts.enqueue(fake_job, 95)
+    _, still_pending = await alerts.flush()
+    if still_pending:
+        await interaction.followup.send(f"⚠️ Test alert queued but not delivered yet ({still_pending} alerts pending).")
+    else:
+        await interaction.followup.send("✅ Test alert sent! Check your Discord channel.")
+
+def format_matches(results, pending=0, missing=0):
+    """Discord message for ranked (score, job) results; notes sources still searching or left out."""
+    if not results:
+        msg = "No internships found." if not pending else "🔍 Searching..."
+    else:
+        msg = "**Top Matches so far:**\n" if pending else "**Top Matches:**\n"
+        for s, job in results:
+            msg += f"• [{job['title']}]({job['link']}) ({s}%) – {job['source']}\n"
+    if pending:
+        msg += f"\n_Still searching {pending} source(s)..._"
+    elif missing:
+        msg += f"\n_{missing} source(s) timed out or failed and are not included._"
+    return msg
 
 @bot.tree.command(name="find_jobs", description="Search internships by keyword.")
 async def find_jobs(interaction: discord.Interaction, query: str):
+    terms = normalize_query(query)
+    if not terms:
+        await interaction.response.send_message("Please enter some keywords to search for.")
+        return
+    profiles = await load_scoring_profiles()
+    user_id = str(interaction.user.id) if interaction.user.id in profiles else DEFAULT_USER
+    profile = profiles.get(user_id)
+    resume = profile["text"] if profile else ""
+    skills = profile["skills"] if profile else []
+
+    # Same query, same résumé within the TTL: answer from the cache without fetching or scoring
+    cache_key = (terms, user_id, resume)
+    cached = find_jobs_cache.get(cache_key)
+    if cached is not None:
+        metrics.inc("find_jobs_cache_total", result="hit")
+        await interaction.response.send_message(format_matches(*cached))
+        return
+    metrics.inc("find_jobs_cache_total", result="miss")
     await interaction.response.send_message(f"🔍 Searching for internships with `{query}`...")
-    jobs = fetch_indeed_query(query)
-    if not jobs:
-        await interaction.followup.send("No internships found.")
+
+    ranked = {}  # link -> (score, job)
+
+    def top_matches():
+        return sorted(ranked.values(), key=lambda r: r[0], reverse=True)[:FIND_JOBS_RESULTS]
+
+    # Postings job_monitor has indexed answer first: keyword prefilter, then rank by similarity
+    # to the user's résumé (or to the query itself when no résumé is uploaded)
+    index = await run_io(load_job_index)
+    query_vec = profiles.embedding(user_id) if profile else await run_cpu(embed_text, query)
+    hits = await run_io(index.search, query_vec, FIND_JOBS_CANDIDATES, terms.split())
+    if hits:
+        scores = apply_adjustments([round(sim * 100, 2) for sim, _ in hits], [job.text for _, job in hits], skills,
+                                   [job.hits for _, job in hits])
+        for score, (_, job) in zip(scores, hits):
+            ranked[job.link] = (score, job)
+
+    async def score_live(jobs):
+        fresh = [job for job in jobs if job.link not in ranked]
+        if fresh:
+            scores = await run_cpu(score_jobs, resume or query, [job.text for job in fresh], skills,
+                                   [job.hits for job in fresh])
+            for score, job in zip(scores, fresh):
+                ranked[job.link] = (score, job)
+
+    # Live boards: postings matching the query are shared across users for the TTL; otherwise
+    # every source is searched concurrently and the message is updated as each one answers
+    live = search_cache.get(terms)
+    missing = 0
+    if live is not None:
+        live_jobs, missing = live
+        await score_live(live_jobs)
+    else:
+        live_jobs = []
+        pending = sum(1 for name, _ in search_sources(terms, CONFIG) if fetch_health.should_fetch(name))
+        last_edit = time.monotonic()
+        if ranked:
+            await interaction.edit_original_response(content=format_matches(top_matches(), pending))
+        async for name, jobs in search_jobs(terms, CONFIG, timeout=SEARCH.get("timeout_seconds", SEARCH_TIMEOUT_SECONDS)):
+            pending -= 1
+            if jobs is None:
+                missing += 1
+                continue
+            live_jobs.extend(jobs)
+            await score_live(jobs)
+            if pending and ranked and time.monotonic() - last_edit >= FIND_JOBS_EDIT_INTERVAL:
+                await interaction.edit_original_response(content=format_matches(top_matches(), pending))
+                last_edit = time.monotonic()
+        search_cache.put(terms, (live_jobs, missing), None if not missing else PARTIAL_TTL_SECONDS)
+
+    result = (top_matches(), 0, missing)
+    find_jobs_cache.put(cache_key, result, None if not missing else PARTIAL_TTL_SECONDS)
+    await interaction.edit_original_response(content=format_matches(*result))
+
+@bot.tree.command(name="source_health", description="List job sources that are failing, quarantined or missing.")
+async def source_health(interaction: discord.Interaction):
+    unhealthy = health_report()
+    if not unhealthy:
+        await interaction.response.send_message("All job sources are healthy.")
         return
+    msg = "**Skipped sources:**\n" + "\n".join(f"• {line}" for line in unhealthy)
+    await interaction.response.send_message(msg[:2000])
+
+def stats_report():
+    """Lines summarizing the metrics registry (cumulative since startup unless noted)."""
+    cycles = metrics.summary("cycle_seconds")
+    if cycles is None:
+        return ["No monitor cycle has completed yet."]
+    count, total, peak, last = cycles
+    finished = time.strftime("%Y-%m-%d %H:%M", time.localtime(metrics.gauge("cycle_completed_timestamp")))
+    lines = [
+        f"**Last cycle:** {last:.1f}s, finished {finished}; {metrics.gauge('cycle_new_postings')} new, "
+        f"{metrics.gauge('cycle_near_duplicates')} near-duplicates",
+        f"**Cycles:** {count}, avg {total / count:.1f}s, max {peak:.1f}s",
+    ]
+
+    fetched, parsed = metrics.total("postings_fetched_total", purpose="poll"), metrics.total("postings_parsed_total")
+    lines.append(
+        f"**Postings:** {fetched} fetched, {parsed} new after seen/keyword filters, "
+        f"{metrics.counter('postings_deduped_total', stage='link')} same-link and "
+        f"{metrics.counter('postings_deduped_total', stage='near_duplicate')} near-duplicates collapsed, "
+        f"{metrics.total('postings_prefiltered_total')} rejected by the TF-IDF prefilter, "
+        f"{metrics.total('postings_scored_total')} scored"
+    )
 
-    resume = resume_text or get_resume_text()
-    results = []
-    for job in jobs[:10]:
-        desc = job.get("description", "")
-        score = hybrid_match_score(resume, job["title"] + " " + desc, RESUME_SKILLS)
-        results.append((score, job))
-    results.sort(reverse=True)
-    top = results[:5]
+    fetches = metrics.summaries_named("fetch_seconds")
+    requests_made = sum(s[0] for _, s in fetches)
+    unchanged = (metrics.total("fetch_responses_total", result="unchanged", purpose="poll")
+                 + metrics.total("fetch_responses_total", result="not_modified", purpose="poll"))
+    slowest = sorted(fetches, key=lambda item: item[1][3], reverse=True)[:3]
+    lines.append(
+        f"**Fetch:** {requests_made} requests, {metrics.total('fetch_bytes_total', purpose='poll') / 1e6:.1f} MB, "
+        f"{unchanged} unchanged, {metrics.total('fetch_failures_total')} failed; slowest last time: "
+        + (", ".join(f"{labels['source']} {s[3]:.2f}s" for labels, s in slowest) or "n/a")
+    )
+    searched = metrics.total("postings_fetched_total", purpose="search")
+    if searched:
+        lines.append(
+            f"**Searches:** {searched} postings fetched, "
+            f"{metrics.total('fetch_bytes_total', purpose='search') / 1e6:.1f} MB, "
+            f"{metrics.total('search_timeouts_total')} source timeouts"
+        )
 
-    msg = "**Top Matches:**\n"
-    for s, job in top:
-        msg += f"• [{job['title']}]({job['link']}) ({s}%) – {job['source']}\n"
-    await interaction.followup.send(msg)
+    encode, batch = metrics.summary("encode_seconds"), metrics.summary("encode_batch_size")
+    if batch:
+        hits = metrics.total("embedding_cache_hits_total")
+        lookups = hits + metrics.total("embedding_cache_misses_total")
+        lines.append(
+            f"**Encoding:** {batch[0]} batches, avg {batch[1] / batch[0]:.0f} texts, "
+            f"{encode[1] if encode else 0:.1f}s in the model, cache hit rate {hits / max(lookups, 1):.0%}"
+        )
+    score = metrics.summary("score_seconds")
+    if score:
+        lines.append(f"**Scoring:** {score[0]} batches, avg {score[1] / score[0]:.2f}s, max {score[2]:.2f}s")
+
+    notify = metrics.summary("notify_seconds")
+    if notify:
+        failures = metrics.total("notify_failures_total")
+        lines.append(
+            f"**Alerts:** {metrics.counter('notify_messages_total', result='sent')} messages "
+            f"({metrics.total('notify_alerts_total')} alerts), "
+            f"{metrics.counter('notify_messages_total', result='undelivered')} undelivered, "
+            f"avg {notify[1] / notify[0]:.2f}s per post, {failures} failed attempts"
+        )
+    return lines
+
+@bot.tree.command(name="stats", description="Show monitor timing metrics; optionally profile the next cycle.")
+async def stats(interaction: discord.Interaction, profile: bool = False):
+    global profile_next_cycle
+    msg = "\n".join(stats_report())
+    if profile:
+        profile_next_cycle = True
+        msg += f"\nThe next cycle will be profiled to `{PROFILE_REPORT}`."
+    msg += f"\nPrometheus metrics: `{METRICS_FILE}`"
+    await interaction.response.send_message(msg[:2000])
+
+async def warm_up_model():
+    """Load the model in the scoring worker in the background after connecting."""
+    t0 = time.perf_counter()
+    try:
+        await run_cpu(load_model)
+        logger.info(f"Model warm-up finished in {time.perf_counter() - t0:.1f}s")
+    except Exception as e:
+        logger.warning(f"Model warm-up failed (will load on first use): {e}")
 
 # --- Event: on_ready ---
+warmed_up = False
+
 @bot.event
 async def on_ready():
+    global warmed_up
+    connected_in = time.perf_counter() - STARTUP_T0
     await bot.tree.sync()
-    job_monitor.start()     # start the background loop
-    print(f"Logged in as {bot.user}")
+    if not job_monitor.is_running():
+        job_monitor.start()     # start the background loop
+    if WARM_UP_MODEL and not warmed_up:
+        warmed_up = True
+        asyncio.create_task(warm_up_model())
+    logger.info(f"Startup: connected to Discord in {connected_in:.2f}s")
+    print(f"Logged in as {bot.user} (ready in {connected_in:.2f}s)")
 
 
 # --- Run the bot ---
-bot.run(TOKEN)
+# Guarded so the spawned scoring worker can import this module without starting a second bot
+if __name__ == "__main__":
+    try:
+        bot.run(TOKEN)
+    finally:
+        shutdown_pools()
@@ -1,40 +1,181 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import re
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+import time
+from functools import lru_cache
 import numpy as np
+from embedding_cache import EmbeddingCache
+from keywords import scan, SKILL_KEYWORDS
+from metrics import metrics
 
-# Load a compact, fast model for sentence embeddings
-model = SentenceTransformer("all-MiniLM-L6-v2")
+# Compact, fast model for sentence embeddings; loaded on first use, not at import
+MODEL_NAME = "all-MiniLM-L6-v2"
+_model = None
+_embedding_cache = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """Return the shared SentenceTransformer, loading it exactly once (thread-safe)."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from sentence_transformers import SentenceTransformer  # pulls in torch
+                _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
+def get_embedding_cache():
+    """Postings already embedded (by any earlier run) are served from disk instead of the model."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        dim = get_model().get_sentence_embedding_dimension()
+        with _model_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(MODEL_NAME, dim)
+    return _embedding_cache
+
+_SKILL_INDEX = {kw.casefold(): i for i, kw in enumerate(SKILL_KEYWORDS)}
+
+# Jobs are encoded this many at a time; large batches amortize the per-call overhead
+ENCODE_BATCH_SIZE = 64
+
+# Score adjustments on top of the 0–100 semantic similarity (replay.py re-scores with other values)
+SKILL_POINTS = 5        # per skill shared by the posting and the résumé
+MAX_SKILL_BOOST = 20    # cap on the total skill bonus
+SENIOR_PENALTY = 25     # subtracted from postings with senior/lead/staff terms
 
 def clean(text):
     return re.sub(r'[^a-zA-Z0-9\s]', '', text.lower())
 
+def encode_texts(texts, batch_size=ENCODE_BATCH_SIZE):
+    """
+    Encode a list of texts into unit-length embeddings (one row per text).
+    Cached texts are read from the embedding cache; only the rest go through the model.
+    """
+    texts = list(texts)
+    embedding_cache = get_embedding_cache()
+    vectors, missing = embedding_cache.lookup(texts)
+    metrics.observe("encode_batch_size", len(texts))
+    metrics.inc("embedding_cache_hits_total", len(texts) - len(missing))
+    metrics.inc("embedding_cache_misses_total", len(missing))
+    if missing:
+        t0 = time.perf_counter()
+        fresh = get_model().encode(
+            [texts[i] for i in missing],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        metrics.observe("encode_seconds", time.perf_counter() - t0)
+        vectors[missing] = fresh
+        embedding_cache.store([texts[i] for i in missing], fresh)
+        embedding_cache.flush()
+    return vectors
+
+@lru_cache(maxsize=8)
+def resume_embedding(resume_text: str):
+    """Embed the résumé once and reuse it for every job scored against it."""
+    return encode_texts([resume_text])[0]
+
 def compute_match(resume_text: str, job_text: str) -> float:
-    
+
     #Returns a similarity score (0–100) between résumé and job posting using semantic embeddings.
-    
+
     if not resume_text or not job_text:
         return 0.0
 
-    embeddings = model.encode([resume_text, job_text], convert_to_numpy=True)
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    embeddings = get_model().encode([resume_text, job_text], convert_to_numpy=True)
     score = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
     return round(float(score) * 100, 2)
 
-def hybrid_match_score(resume_text, job_text, resume_skills):
-    #Looks at semantic similarity + skill overlap to produce a better score.
-    
-    sem_score = compute_match(resume_text, job_text)  # 0–100 range
+def batch_match_scores(resume_text, job_texts, resume_skills, batch_size=ENCODE_BATCH_SIZE,
+                       return_embeddings=False, job_hits=None):
+    """
+    Score many job postings against one résumé.
+    Returns a list of hybrid scores (0–100) in the same order as job_texts; with
+    return_embeddings, returns (scores, job embeddings) so callers can index the postings.
+    job_hits: keyword hits already computed at ingestion (Job.hits); otherwise texts are scanned.
+    """
+    job_texts = list(job_texts)
+    sem_scores = np.zeros(len(job_texts))
+    job_vecs = None
 
-    # Bonus: count overlap between extracted skills and job posting
-    overlap = sum(kw in job_text.lower() for kw in resume_skills)
-    skill_boost = min(overlap * 5, 20)  # up to +20 points
+    # Only non-empty postings go to the model; empty ones keep a 0 semantic score
+    idx = [i for i, t in enumerate(job_texts) if t]
+    if idx and (resume_text or return_embeddings):
+        encoded = encode_texts([job_texts[i] for i in idx], batch_size=batch_size)
+        job_vecs = np.zeros((len(job_texts), encoded.shape[1]), dtype=np.float32)
+        job_vecs[idx] = encoded
+        if resume_text:
+            sims = encoded @ resume_embedding(resume_text)  # one matrix-vector product
+            sem_scores[idx] = np.round(sims * 100, 2)
+
+    scores = apply_adjustments(sem_scores, job_texts, resume_skills, job_hits)
+    if return_embeddings:
+        return scores, job_vecs
+    return scores
+
+def apply_adjustments(sem_scores, job_texts, resume_skills, job_hits=None):
+    """
+    Add the skill-overlap boost and senior-role penalty to semantic scores (0–100).
+    job_hits: keyword hits already computed at ingestion (Job.hits); otherwise texts are scanned.
+    """
+    sem_matrix = np.asarray(sem_scores, dtype=float).reshape(-1, 1)
+    final_scores = adjust_score_matrix(sem_matrix, job_texts, [resume_skills], job_hits)[:, 0]
+    return [round(float(s), 2) for s in final_scores]
+
+def _skill_matrix(skill_sets):
+    """Binary rows × SKILL_KEYWORDS matrix marking which skills each set contains."""
+    matrix = np.zeros((len(skill_sets), len(_SKILL_INDEX)))
+    for row, skills in enumerate(skill_sets):
+        cols = [_SKILL_INDEX[kw] for kw in skills if kw in _SKILL_INDEX]
+        matrix[row, cols] = 1
+    return matrix
+
+def adjust_score_matrix(sem_scores, job_texts, resume_skill_sets, job_hits=None,
+                        skill_points=SKILL_POINTS, max_skill_boost=MAX_SKILL_BOOST, senior_penalty=SENIOR_PENALTY):
+    """
+    Apply the skill boost and senior penalty to a jobs × résumés matrix of semantic scores.
+    Skill overlap for every (job, résumé) pair is one product of binary skill matrices.
+    job_hits: keyword hits already computed at ingestion (Job.hits); otherwise texts are scanned.
+    """
+    sem_scores = np.array(sem_scores, dtype=float)
+    hits = job_hits if job_hits is not None else [scan(t) for t in job_texts]  # one keyword pass per posting
+
+    # Bonus: count overlap between extracted skills and each job posting
+    overlap = _skill_matrix([h["skill"] for h in hits]) @ _skill_matrix(resume_skill_sets).T
+    skill_boost = np.minimum(overlap * skill_points, max_skill_boost)
 
     # Penalize senior roles
-    senior_terms = ["senior", "lead", "manager", "director", "principal"]
-    if any(t in job_text.lower() for t in senior_terms):
-        sem_score -= 25
+    senior = np.array([bool(h["seniority"]) for h in hits])
+    sem_scores -= senior_penalty * senior[:, None]
+
+    return np.round(np.clip(sem_scores + skill_boost, 0, 100), 2)
 
-    final_score = min(max(sem_score + skill_boost, 0), 100)
-    return round(final_score, 2)
+def score_jobs_for_users(job_texts, resume_vecs, resume_skill_sets, batch_size=ENCODE_BATCH_SIZE, job_hits=None):
+    """
+    Score a batch of postings against many résumés at once.
+    Jobs are encoded once; returns (jobs × users score matrix, job embeddings).
+    """
+    job_texts = list(job_texts)
+    n_users = 0 if resume_vecs is None else len(resume_vecs)
+    sem_scores = np.zeros((len(job_texts), n_users))
+    job_vecs = None
+
+    idx = [i for i, t in enumerate(job_texts) if t]
+    if idx:
+        encoded = encode_texts([job_texts[i] for i in idx], batch_size=batch_size)
+        job_vecs = np.zeros((len(job_texts), encoded.shape[1]), dtype=np.float32)
+        job_vecs[idx] = encoded
+        if n_users:
+            sims = encoded @ np.asarray(resume_vecs, dtype=np.float32).T  # jobs × users in one product
+            sem_scores[idx] = np.round(sims * 100, 2)
+
+    if not n_users:
+        return sem_scores, job_vecs
+    return adjust_score_matrix(sem_scores, job_texts, resume_skill_sets, job_hits), job_vecs
+
+def hybrid_match_score(resume_text, job_text, resume_skills):
+    #Looks at semantic similarity + skill overlap to produce a better score.
+    return batch_match_scores(resume_text, [job_text], resume_skills)[0]
@@ -0,0 +1,214 @@
+# src/metrics.py
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+from utils import atomic_write
+
+METRICS_FILE = "src/data/metrics.prom"      # Prometheus text format, rewritten after every cycle
+PROFILE_FILE = "src/logs/cycle.prof"        # cProfile dump of a profiled cycle (open with pstats/snakeviz)
+PROFILE_REPORT = "src/logs/cycle_profile.txt"
+PREFIX = "internscope_"
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and timing summaries, each identified by a name and labels.
+    Summaries keep count, sum, max and the last observation. Worker processes keep their own
+    registry; drain() hands its contents to the parent, which folds them in with merge().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}   # (name, labels) -> value
+        self.gauges = {}     # (name, labels) -> value
+        self.summaries = {}  # (name, labels) -> [count, sum, max, last]
+
+    def inc(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            summary = self.summaries.get(key)
+            if summary is None:
+                self.summaries[key] = [1, value, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                summary[2] = max(summary[2], value)
+                summary[3] = value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the wall time of the with-block, in seconds."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    # --- Reading ---
+    def counter(self, name, **labels):
+        return self.counters.get(_key(name, labels), 0)
+
+    def total(self, name, **labels):
+        """Sum of a counter across every series whose labels include the given ones."""
+        wanted = set(_key(name, labels)[1])
+        with self._lock:
+            return sum(v for (n, series), v in self.counters.items() if n == name and wanted <= set(series))
+
+    def gauge(self, name, **labels):
+        return self.gauges.get(_key(name, labels))
+
+    def summary(self, name, **labels):
+        """(count, sum, max, last) of a summary, or None if nothing was observed."""
+        summary = self.summaries.get(_key(name, labels))
+        return tuple(summary) if summary else None
+
+    def summaries_named(self, name):
+        """[(labels dict, (count, sum, max, last))] for every label set of a summary."""
+        with self._lock:
+            return [(dict(labels), tuple(s)) for (n, labels), s in self.summaries.items() if n == name]
+
+    # --- Crossing process boundaries ---
+    def drain(self):
+        """Return everything recorded so far as a picklable snapshot, and reset."""
+        with self._lock:
+            snapshot = (self.counters, self.gauges, self.summaries)
+            self.counters, self.gauges, self.summaries = {}, {}, {}
+        return snapshot
+
+    def merge(self, snapshot):
+        counters, gauges, summaries = snapshot
+        with self._lock:
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            self.gauges.update(gauges)
+            for key, (count, total, peak, last) in summaries.items():
+                summary = self.summaries.get(key)
+                if summary is None:
+                    self.summaries[key] = [count, total, peak, last]
+                else:
+                    summary[0] += count
+                    summary[1] += total
+                    summary[2] = max(summary[2], peak)
+                    summary[3] = last
+
+    # --- Export ---
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for kind, series in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted({n for n, _ in series}):
+                    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                    for (n, labels), value in sorted(series.items()):
+                        if n == name:
+                            lines.append(f"{PREFIX}{name}{_label_text(labels)} {value}")
+            for name in sorted({n for n, _ in self.summaries}):
+                lines.append(f"# TYPE {PREFIX}{name} summary")
+                for (n, labels), (count, total, peak, last) in sorted(self.summaries.items()):
+                    if n == name:
+                        lines.append(f"{PREFIX}{name}_sum{_label_text(labels)} {total}")
+                        lines.append(f"{PREFIX}{name}_count{_label_text(labels)} {count}")
+                lines.append(f"# TYPE {PREFIX}{name}_max gauge")
+                for (n, labels), (count, total, peak, last) in sorted(self.summaries.items()):
+                    if n == name:
+                        lines.append(f"{PREFIX}{name}_max{_label_text(labels)} {peak}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=METRICS_FILE):
+        """Write the metrics for a node_exporter textfile collector (atomically replaced)."""
+        atomic_write(path, self.render_prometheus())
+
+
+# Process-wide registry; the bot, scraper, notifier and (in its own process) the matcher record here
+metrics = MetricsRegistry()
+
+
+# --- Profiling: the event loop plus every call it offloads to worker threads and processes ---
+# Stats of offloaded calls made inside a profiled() block, collected for merging (None outside one)
+_profile_parts = contextvars.ContextVar("profile_parts", default=None)
+
+
+class _ProfileSnapshot:
+    """Raw cProfile stats in picklable form; pstats.Stats.add() accepts it like a Profile."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def profile_parts():
+    """The list collecting offloaded calls' stats while a profiled() block runs, else None."""
+    return _profile_parts.get()
+
+def call_profiled(fn, *args, **kwargs):
+    """
+    Run fn under its own cProfile; returns (result, stats snapshot). Module-level so it also runs
+    in worker processes. The snapshot is None when another profiler already covers this thread.
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # Python 3.12+ allows one profiler per interpreter, and it sees every thread
+        return fn(*args, **kwargs), None
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+    profiler.create_stats()
+    return result, _ProfileSnapshot(profiler.stats)
+
+@contextmanager
+def profiled(enabled=True, path=PROFILE_FILE, report_path=PROFILE_REPORT, top=40):
+    """
+    cProfile the with-block when enabled, saving the raw stats to path and the top functions by
+    cumulative time to report_path. Besides the calling thread (the event loop), calls offloaded
+    through pipeline.run_io/run_cpu/to_thread from within the block are profiled where they run
+    and merged in; other tasks' offloaded calls (e.g. slash commands) are left out.
+    """
+    if not enabled:
+        yield
+        return
+    parts = []
+    token = _profile_parts.set(parts)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _profile_parts.reset(token)
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        for part in parts:
+            stats.add(part)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        stats.dump_stats(path)
+        stats.sort_stats("cumulative").print_stats(top)
+        with open(report_path, "w") as f:
+            f.write(out.getvalue())
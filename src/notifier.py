@@ -1,35 +1,48 @@
 # src/notifier.py
+import asyncio
+import logging
 import os
+import time
+import aiohttp
 import requests
 from dotenv import load_dotenv
+from metrics import metrics
+from utils import atomic_write_json, load_json
 
 load_dotenv()
 WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
 
-def notify_discord(job, score):
-    """
-    Sends a job match alert to your Discord channel using a webhook.
-    """
-    if not WEBHOOK_URL:
-        print("No Discord webhook URL found in .env")
-        return
+PENDING_FILE = "src/data/pending_alerts.json"  # alerts not yet delivered survive restarts
+MAX_EMBEDS_PER_MESSAGE = 10  # Discord's limit per webhook message
+MAX_RETRIES = 5
+REQUEST_TIMEOUT = 15
+
+logger = logging.getLogger("InternScope")
 
+def build_message(embeds, user_id=None):
+    """Webhook payload for a list of embeds, mentioning user_id if it is a Discord user id."""
+    data = {"embeds": embeds}
+    if user_id and str(user_id).isdigit():
+        data["content"] = f"<@{user_id}>"
+        data["allowed_mentions"] = {"users": [str(user_id)]}
+    return data
+
+def build_embed(job, score):
     title = job.get("title", "Untitled Job")
     company = job.get("company", "Unknown Company")
     link = job.get("link", "")
     location = job.get("location", "N/A")
-    description = job.get("description", "No description available.")
     source = job.get("source", "Unknown Source")
 
     color = 0x2ecc71 if score >= 85 else (0xf1c40f if score >= 70 else 0xe74c3c)
 
-    embed = {
+    return {
         "title": f"🚀 {title}",
         "url": link,
         "color": color,
         "fields": [
-            {"name": "Company", "value": company, "inline": True},
-            {"name": "Location", "value": location, "inline": True},
+            {"name": "Company", "value": company or "N/A", "inline": True},
+            {"name": "Location", "value": location or "N/A", "inline": True},
             {"name": "Source", "value": source, "inline": True},
             {"name": "Match Score", "value": f"**{score}%**", "inline": False},
         ],
@@ -39,17 +52,141 @@ def notify_discord(job, score):
         }
     }
 
-    data = {"embeds": [embed]}
+def notify_discord(job, score, user_id=None):
+    """
+    Sends a job match alert to your Discord channel using a webhook.
+    If user_id is a Discord user id, the alert mentions that user.
+    """
+    if not WEBHOOK_URL:
+        print("No Discord webhook URL found in .env")
+        return
+
+    data = build_message([build_embed(job, score)], user_id)
 
     try:
-        resp = requests.post(WEBHOOK_URL, json=data)
+        resp = requests.post(WEBHOOK_URL, json=data, timeout=REQUEST_TIMEOUT)
         if resp.status_code == 204:
-            print(f"Sent notification for {company}: {title} ({score}%)")
+            print(f"Sent notification for {job.get('company')}: {job.get('title')} ({score}%)")
         else:
             print(f"Discord webhook failed with status {resp.status_code}: {resp.text}")
     except Exception as e:
         print(f"Error sending Discord notification: {e}")
 
+
+class NotificationQueue:
+    """
+    Batches alerts into webhook messages of up to 10 embeds (one mention per message) and
+    delivers them over a pooled aiohttp session. 429s are retried after Retry-After, an exhausted
+    rate-limit bucket is waited out before the next post, and 5xx/network errors back off
+    exponentially. Undelivered alerts are kept in PENDING_FILE until a later flush succeeds.
+    """
+
+    def __init__(self, webhook_url=WEBHOOK_URL, pending_path=PENDING_FILE):
+        self.webhook_url = webhook_url
+        self.pending_path = pending_path
+        self.pending = self._load()
+        self._session = None
+        self._lock = asyncio.Lock()
+
+    def _load(self):
+        return load_json(self.pending_path, [])
+
+    def _save(self):
+        atomic_write_json(self.pending_path, self.pending)
+
+    def __len__(self):
+        return len(self.pending)
+
+    def enqueue(self, job, score, user_id=None):
+        self.pending.append({"user_id": user_id, "embed": build_embed(job, score)})
+
+    def _session_for_loop(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+        return self._session
+
+    def _batches(self):
+        """Group pending alerts by recipient into messages of at most MAX_EMBEDS_PER_MESSAGE."""
+        by_user = {}
+        for alert in self.pending:
+            by_user.setdefault(alert["user_id"], []).append(alert)
+        for user_id, alerts in by_user.items():
+            for i in range(0, len(alerts), MAX_EMBEDS_PER_MESSAGE):
+                yield user_id, alerts[i:i + MAX_EMBEDS_PER_MESSAGE]
+
+    async def _post(self, data):
+        """Post one message; returns True once delivered, False if it should stay queued."""
+        session = self._session_for_loop()
+        for attempt in range(MAX_RETRIES):
+            try:
+                async with session.post(self.webhook_url, json=data) as resp:
+                    if resp.status in (200, 204):
+                        if resp.headers.get("X-RateLimit-Remaining") == "0":
+                            await asyncio.sleep(float(resp.headers.get("X-RateLimit-Reset-After", 1)))
+                        return True
+                    if resp.status == 429:
+                        metrics.inc("notify_failures_total", reason="rate_limited")
+                        retry_after = resp.headers.get("Retry-After")
+                        if retry_after is None:
+                            try:
+                                body = await resp.json(content_type=None)
+                                retry_after = body.get("retry_after", 1) if isinstance(body, dict) else 1
+                            except ValueError:  # non-JSON body (e.g. a proxy's HTML error page)
+                                retry_after = 1
+                        logger.info(f"Discord webhook rate limited; retrying in {retry_after}s")
+                        await asyncio.sleep(float(retry_after))
+                        continue
+                    if resp.status < 500:
+                        # Malformed payload or deleted webhook; retrying would not help
+                        metrics.inc("notify_failures_total", reason="rejected")
+                        logger.warning(f"Discord webhook rejected alert ({resp.status}): {await resp.text()}")
+                        return True
+                    metrics.inc("notify_failures_total", reason="server_error")
+                    logger.warning(f"Discord webhook failed with status {resp.status}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                metrics.inc("notify_failures_total", reason="network")
+                logger.warning(f"Error sending Discord notification: {e}")
+            await asyncio.sleep(2 ** attempt)
+        return False
+
+    async def flush(self):
+        """Deliver every pending alert; returns (messages sent, alerts still pending)."""
+        if not self.webhook_url:
+            print("No Discord webhook URL found in .env")
+            return 0, len(self.pending)
+        async with self._lock:
+            await asyncio.to_thread(self._save)  # persist before sending so a crash loses nothing
+            sent = 0
+            for user_id, alerts in list(self._batches()):
+                data = build_message([a["embed"] for a in alerts], user_id)
+                t0 = time.perf_counter()
+                delivered_ok = await self._post(data)
+                metrics.observe("notify_seconds", time.perf_counter() - t0)
+                if not delivered_ok:
+                    metrics.inc("notify_messages_total", result="undelivered")
+                    continue
+                metrics.inc("notify_messages_total", result="sent")
+                metrics.inc("notify_alerts_total", len(alerts))
+                sent += 1
+                delivered = {id(a) for a in alerts}
+                self.pending = [a for a in self.pending if id(a) not in delivered]
+                await asyncio.to_thread(self._save)
+            return sent, len(self.pending)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+_queue = None
+
+def load_notification_queue():
+    """Return the process-wide notification queue (pending alerts reloaded from disk)."""
+    global _queue
+    if _queue is None:
+        _queue = NotificationQueue()
+    return _queue
+
 if __name__ == "__main__":
     fake_job = {
         "title": "Software Developer",
@@ -60,4 +197,3 @@ if __name__ == "__main__":
         "source": "Manual Test"
     }
     notify_discord(fake_job, 88)
-
@@ -0,0 +1,110 @@
+# src/pipeline.py
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+from metrics import call_profiled, profile_parts
+
+# Blocking I/O (file reads/writes, PDF parsing, webhook posts) runs on threads;
+# model inference runs in a separate process so it never holds the bot's GIL.
+IO_WORKERS = 4
+CPU_WORKERS = 1  # one process keeps a single warm copy of the model and embedding cache
+
+io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="internscope-io")
+_cpu_pool = None
+
+def get_cpu_pool():
+    """Create the process pool on first use ("spawn" so the worker never inherits the bot's threads)."""
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = ProcessPoolExecutor(
+            max_workers=CPU_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _cpu_pool
+
+async def _offload(executor, fn, args, kwargs):
+    # Inside a profiled cycle the call is profiled where it runs and its stats merged into the cycle's
+    loop = asyncio.get_running_loop()
+    parts = profile_parts()
+    if parts is None:
+        return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+    result, stats = await loop.run_in_executor(executor, partial(call_profiled, fn, *args, **kwargs))
+    if stats is not None:
+        parts.append(stats)
+    return result
+
+async def run_io(fn, *args, **kwargs):
+    """Run a blocking I/O call on the thread pool and await its result."""
+    return await _offload(io_pool, fn, args, kwargs)
+
+async def run_cpu(fn, *args, **kwargs):
+    """Run a CPU-heavy call in the worker process and await its result."""
+    return await _offload(get_cpu_pool(), fn, args, kwargs)
+
+async def to_thread(fn, *args, **kwargs):
+    """asyncio.to_thread() for short decode/parse steps (default executor), profiled like run_io."""
+    return await _offload(None, fn, args, kwargs)
+
+def shutdown():
+    global _cpu_pool
+    io_pool.shutdown(wait=False, cancel_futures=True)
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
+
+# --- Worker-process stages (module-level so they can be pickled by reference) ---
+def score_jobs(resume_text, job_texts, resume_skills, job_hits=None):
+    """Batch-score job texts against a résumé; the matcher (and its model) loads inside the worker."""
+    from matcher import batch_match_scores
+    return batch_match_scores(resume_text, job_texts, resume_skills, job_hits=job_hits)
+
+def score_jobs_for_users(job_texts, resume_vecs, resume_skill_sets, job_hits=None):
+    """Jobs × users score matrix plus job embeddings, from a single encode of the postings."""
+    from matcher import score_jobs_for_users as score_matrix
+    return score_matrix(job_texts, resume_vecs, resume_skill_sets, job_hits=job_hits)
+
+def embed_text(text):
+    """Unit-length embedding of one text (the résumé, or a search query)."""
+    from matcher import resume_embedding
+    return resume_embedding(text)
+
+def make_encode_pool(workers=None):
+    """
+    Process pool for bulk encoding (bootstrap/backfill): one model copy per worker, with torch's
+    intra-op threads split between workers so they don't oversubscribe the cores.
+    """
+    workers = workers or os.cpu_count() or 1
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_encoder,
+        initargs=(max(1, (os.cpu_count() or 1) // workers),),
+    )
+
+def _init_encoder(threads):
+    import torch
+    torch.set_num_threads(threads)
+
+def encode_shard(texts):
+    """Unit-length embeddings of a shard of texts, bypassing the (single-writer) embedding cache."""
+    from matcher import get_model, ENCODE_BATCH_SIZE
+    return get_model().encode(texts, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True,
+                              normalize_embeddings=True)
+
+def encoder_dim():
+    from matcher import get_model
+    return get_model().get_sentence_embedding_dimension()
+
+def drain_metrics():
+    """Metrics recorded in the worker (encode time, batch sizes, cache hits) since the last call."""
+    from metrics import metrics
+    return metrics.drain()
+
+def load_model():
+    """Load the model (and embedding cache) in the worker so the first cycle doesn't pay for it."""
+    from matcher import get_model, get_embedding_cache
+    get_model()
+    get_embedding_cache()
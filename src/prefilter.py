@@ -0,0 +1,90 @@
+# src/prefilter.py
+import os
+import threading
+
+import numpy as np
+
+from utils import atomic_savez
+
+PREFILTER_FILE = "src/data/prefilter.npz"
+N_FEATURES = 2 ** 18      # hashed unigram + bigram space; no vocabulary to grow or refit
+MIN_DOCUMENTS = 200       # below this the IDF is too noisy to reject anything, so everything passes
+MIN_SIMILARITY = 0.02     # default recall cutoff on TF-IDF cosine similarity (kept loose: misses are never scored)
+
+
+class SparsePrefilter:
+    """
+    First-stage scorer: TF-IDF over hashed word unigrams and bigrams, with document frequencies
+    accumulated incrementally from every posting seen (partial_fit), so it never needs a refit.
+    Postings × résumés similarity is one sparse matrix product; only postings that clear the
+    cutoff for some résumé (or rank in its top_k) go on to the embedding model.
+    """
+
+    def __init__(self, path=PREFILTER_FILE):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.path = path
+        self._lock = threading.Lock()
+        self.vectorizer = HashingVectorizer(
+            n_features=N_FEATURES, ngram_range=(1, 2), stop_words="english",
+            alternate_sign=False, norm=None,
+        )
+        self.doc_freq = np.zeros(N_FEATURES, dtype=np.float64)
+        self.n_docs = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with np.load(self.path) as data:
+            if data["doc_freq"].shape == self.doc_freq.shape:
+                self.doc_freq = data["doc_freq"].astype(np.float64)
+                self.n_docs = int(data["n_docs"])
+
+    def partial_fit(self, texts):
+        """Add postings to the document-frequency counts."""
+        counts = self.vectorizer.transform(texts)
+        with self._lock:
+            self.doc_freq += np.bincount(counts.indices, minlength=N_FEATURES)
+            self.n_docs += counts.shape[0]
+
+    def transform(self, texts):
+        """Unit-length sublinear TF-IDF rows (scipy CSR)."""
+        from sklearn.preprocessing import normalize
+        matrix = self.vectorizer.transform(texts).astype(np.float64)
+        matrix.data = 1 + np.log(matrix.data)
+        idf = np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+        matrix.data *= idf[matrix.indices]
+        return normalize(matrix)
+
+    def scores(self, job_texts, resume_texts):
+        """Dense jobs × résumés matrix of TF-IDF cosine similarities."""
+        return (self.transform(job_texts) @ self.transform(resume_texts).T).toarray()
+
+    def select(self, job_texts, resume_texts, min_similarity=MIN_SIMILARITY, top_k=None):
+        """
+        Indices of the postings worth embedding: similarity >= min_similarity for at least one
+        résumé, or among that résumé's top_k in this batch. Everything passes while the corpus
+        is smaller than MIN_DOCUMENTS or there are no résumés to compare against.
+        """
+        if self.n_docs < MIN_DOCUMENTS or not resume_texts or not job_texts:
+            return list(range(len(job_texts)))
+        sims = self.scores(job_texts, resume_texts)
+        keep = (sims >= min_similarity).any(axis=1)
+        if top_k:
+            top = np.argsort(-sims, axis=0)[:top_k]
+            keep[np.unique(top)] = True
+        return np.flatnonzero(keep).tolist()
+
+    def save(self):
+        with self._lock:
+            atomic_savez(self.path, compressed=True, doc_freq=self.doc_freq.astype(np.float32), n_docs=self.n_docs)
+
+
+_prefilter = None
+
+def load_prefilter():
+    """Return the process-wide prefilter (document frequencies loaded from disk once)."""
+    global _prefilter
+    if _prefilter is None:
+        _prefilter = SparsePrefilter()
+    return _prefilter
@@ -0,0 +1,102 @@
+# src/profiles.py
+import os
+import threading
+
+import numpy as np
+
+from utils import atomic_savez, atomic_write_json, load_json
+
+PROFILE_DIR = "src/data/profiles"
+RESUME_DIR = os.path.join(PROFILE_DIR, "resumes")
+DEFAULT_USER = "default"  # the legacy single résumé in src/data, used in memory only while no one has uploaded one
+
+
+def resume_path(user_id):
+    """Where a user's uploaded résumé PDF is kept."""
+    return os.path.join(RESUME_DIR, f"{user_id}.pdf")
+
+
+class ProfileStore:
+    """
+    Per-Discord-user résumé profiles: extracted text, skills and a precomputed résumé embedding.
+    Profiles live in profiles.json and the embeddings in embeddings.npz, both keyed by user id,
+    so a monitor cycle can score every user at once with a single jobs × users matrix.
+    """
+
+    def __init__(self, profile_dir=PROFILE_DIR):
+        self.profiles_path = os.path.join(profile_dir, "profiles.json")
+        self.embeddings_path = os.path.join(profile_dir, "embeddings.npz")
+        self.profile_dir = profile_dir
+        self._lock = threading.Lock()
+        self.profiles = {}
+        self.embeddings = {}
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.profiles_path):
+            self.profiles = load_json(self.profiles_path, {})
+            self.profiles.pop(DEFAULT_USER, None)  # older versions saved the sample résumé
+        if os.path.exists(self.embeddings_path):
+            with np.load(self.embeddings_path) as data:
+                self.embeddings = {uid: data[uid] for uid in data.files if uid in self.profiles}
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def __contains__(self, user_id):
+        return str(user_id) in self.profiles
+
+    def get(self, user_id):
+        """Return the profile dict ({text, skills, resume_path}) for a user, or None."""
+        return self.profiles.get(str(user_id))
+
+    def embedding(self, user_id):
+        return self.embeddings.get(str(user_id))
+
+    def set_profile(self, user_id, text, skills, path, embedding=None):
+        with self._lock:
+            uid = str(user_id)
+            self.profiles[uid] = {"text": text, "skills": list(skills), "resume_path": path}
+            self.embeddings.pop(uid, None)
+            if embedding is not None:
+                self.embeddings[uid] = np.asarray(embedding, dtype=np.float32)
+
+    def set_embedding(self, user_id, embedding):
+        with self._lock:
+            self.embeddings[str(user_id)] = np.asarray(embedding, dtype=np.float32)
+
+    def remove(self, user_id):
+        """Drop a user's profile; returns the removed profile (or None)."""
+        with self._lock:
+            uid = str(user_id)
+            self.embeddings.pop(uid, None)
+            return self.profiles.pop(uid, None)
+
+    def missing_embeddings(self):
+        """User ids whose résumé has not been embedded yet."""
+        return [uid for uid in self.profiles if uid not in self.embeddings]
+
+    def matrix(self):
+        """Return (user_ids, users × dim embedding matrix, list of skill sets) for embedded users."""
+        with self._lock:
+            user_ids = [uid for uid in self.profiles if uid in self.embeddings]
+            if not user_ids:
+                return [], None, []
+            vectors = np.stack([self.embeddings[uid] for uid in user_ids])
+            skills = [set(self.profiles[uid]["skills"]) for uid in user_ids]
+        return user_ids, vectors, skills
+
+    def save(self):
+        with self._lock:
+            atomic_write_json(self.profiles_path, {uid: p for uid, p in self.profiles.items() if uid != DEFAULT_USER})
+            atomic_savez(self.embeddings_path, **{uid: v for uid, v in self.embeddings.items() if uid != DEFAULT_USER})
+
+
+_profiles = None
+
+def load_profiles():
+    """Return the profile store (loaded from disk once per process)."""
+    global _profiles
+    if _profiles is None:
+        _profiles = ProfileStore()
+    return _profiles
@@ -0,0 +1,240 @@
+# src/replay.py
+"""
+Offline replay of the response archive for tuning the match settings.
+
+With "archive_responses": true in config.json, each board's first response and every change
+after it are appended to src/data/archive. This script parses that history again with the scraper's own parsers, dedups
+on links and near-duplicate signatures, applies the prefilter and embeds the postings on a
+pool of worker processes, caching embeddings in src/data/replay_embeddings. It then scores them
+against every profile with no network access and nothing written to the live stores. Semantic scores are
+computed once, so the current settings and a candidate set are compared in the same run.
+Run from the repo root:
+
+    python src/replay.py --threshold 65 --senior-penalty 15
+    python src/replay.py --since 2026-07-01 --save src/data/replay_alerts.json
+    python src/replay.py --compare src/data/replay_alerts.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import feedparser
+import numpy as np
+
+from archive import ResponseArchive, ARCHIVE_DIR
+from bootstrap import encode_all
+from dedup import NearDuplicateIndex
+from logger import setup_logger
+from matcher import adjust_score_matrix, SKILL_POINTS, MAX_SKILL_BOOST, SENIOR_PENALTY
+from pipeline import make_encode_pool
+from prefilter import SparsePrefilter, MIN_SIMILARITY
+from profiles import load_profiles
+from scraper import iter_lever_postings, iter_greenhouse_postings, iter_indeed_entries, iter_workday_page, STREAM_BATCH_SIZE
+from storage import SeenStore
+from utils import atomic_write_json
+
+SHOW_CHANGES = 10  # alerts listed per direction when two alert sets differ
+# Replay's own embedding cache. The bot is the only writer of the live one (src/data/embeddings),
+# so replay never opens it; this one is reused across replay runs while tuning
+REPLAY_CACHE_DIR = "src/data/replay_embeddings"
+
+logger = setup_logger()
+
+
+def parse_record(source, url, body, is_seen=None):
+    """Postings in one archived response, parsed exactly as the live fetchers parse it."""
+    kind, _, key = source.partition(":")
+    if kind == "lever":
+        return iter_lever_postings(key, json.loads(body), is_seen)
+    if kind == "greenhouse":
+        return iter_greenhouse_postings(key, json.loads(body), is_seen)
+    if kind == "indeed":
+        return iter_indeed_entries(feedparser.parse(body), is_seen)
+    if kind == "workday":
+        return iter_workday_page(url, body.decode("utf-8", errors="replace"), is_seen)
+    logger.warning(f"Replay: unknown source {source!r} for {url}, skipped")
+    return ()
+
+def load_postings(archive, since=None, until=None):
+    """Unique postings in archive order, each with the time it was first fetched."""
+    jobs, first_seen, links = [], [], set()
+    records = 0
+    for ts, source, url, body in archive.iter_records(since, until):
+        records += 1
+        try:
+            parsed = list(parse_record(source, url, body, links.__contains__))
+        except ValueError as e:
+            logger.warning(f"Replay: could not parse {source} response from {url}: {e}")
+            continue
+        for job in parsed:
+            if job.link not in links:
+                links.add(job.link)
+                jobs.append(job)
+                first_seen.append(ts)
+    return jobs, first_seen, records
+
+def match_settings(config, threshold=None, skill_points=None, max_skill_boost=None, senior_penalty=None):
+    """Scoring settings: config.json / matcher defaults, with any given value overriding them."""
+    def pick(value, default):
+        return default if value is None else value
+    return {
+        "threshold": pick(threshold, config["match_threshold"]),
+        "skill_points": pick(skill_points, SKILL_POINTS),
+        "max_skill_boost": pick(max_skill_boost, MAX_SKILL_BOOST),
+        "senior_penalty": pick(senior_penalty, SENIOR_PENALTY),
+    }
+
+def alert_set(sem, jobs, first_seen, user_ids, skill_sets, settings):
+    """{(user_id, link): alert dict} for every (posting, user) pair at or above the threshold."""
+    if sem is None:
+        return {}
+    scores = adjust_score_matrix(
+        sem, None, skill_sets, [job.hits for job in jobs], settings["skill_points"],
+        settings["max_skill_boost"], settings["senior_penalty"],
+    )
+    alerts = {}
+    for row, col in zip(*np.nonzero(scores >= settings["threshold"])):
+        job = jobs[row]
+        alerts[(user_ids[col], job.link)] = {
+            "user_id": user_ids[col], "link": job.link, "title": job.title, "company": job.company,
+            "source": job.source, "score": float(scores[row, col]), "first_seen": first_seen[row],
+        }
+    return alerts
+
+def compare_alerts(before, after):
+    """(added, dropped, kept count) between two alert sets keyed by (user_id, link)."""
+    added = [after[key] for key in after.keys() - before.keys()]
+    dropped = [before[key] for key in before.keys() - after.keys()]
+    added.sort(key=lambda alert: alert["score"], reverse=True)
+    dropped.sort(key=lambda alert: alert["score"], reverse=True)
+    return added, dropped, len(before.keys() & after.keys())
+
+def run_replay(config, candidate, since=None, until=None, workers=None, use_prefilter=True,
+               archive_dir=ARCHIVE_DIR):
+    """
+    Replay the archive; returns (stats, current alerts, candidate alerts).
+    candidate: settings dict from match_settings().
+    """
+    stats = {}
+    t_start = time.perf_counter()
+
+    # 1. Parse every archived response (link dedup keeps each posting's first appearance)
+    t0 = time.perf_counter()
+    jobs, first_seen, stats["records"] = load_postings(ResponseArchive(archive_dir), since, until)
+    stats["parsed"], stats["parse_seconds"] = len(jobs), time.perf_counter() - t0
+
+    # 2. Near-duplicate and prefilter passes, batch by batch in archive order like the live loop,
+    #    against scratch state so the live seen store and prefilter statistics are untouched
+    profiles = load_profiles()
+    resume_texts = [profile["text"] for profile in profiles.profiles.values()]
+    prefilter_config = config.get("prefilter", {})
+    kept, kept_seen = [], []
+    stats["near_duplicates"] = stats["prefiltered"] = 0
+    with tempfile.TemporaryDirectory() as scratch:
+        store = SeenStore(os.path.join(scratch, "seen.db"), legacy_path=None)
+        near_dups = NearDuplicateIndex(store)
+        prefilter = SparsePrefilter(os.path.join(scratch, "prefilter.npz")) if use_prefilter else None
+        for start in range(0, len(jobs), STREAM_BATCH_SIZE):
+            batch = jobs[start:start + STREAM_BATCH_SIZE]
+            times = dict(zip((job.link for job in batch), first_seen[start:start + STREAM_BATCH_SIZE]))
+            batch, dups = near_dups.filter(batch)
+            near_dups.commit()
+            stats["near_duplicates"] += len(dups)
+            if prefilter is not None and batch:
+                texts = [job.text for job in batch]
+                prefilter.partial_fit(texts)
+                keep = prefilter.select(texts, resume_texts, prefilter_config.get("min_similarity", MIN_SIMILARITY),
+                                        prefilter_config.get("top_k"))
+                stats["prefiltered"] += len(batch) - len(keep)
+                batch = [batch[i] for i in keep]
+            kept.extend(batch)
+            kept_seen.extend(times[job.link] for job in batch)
+        store.close()
+    jobs, first_seen = kept, kept_seen
+
+    # 3. Embed postings (and résumés without a stored embedding; not saved back)
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    vectors, stats["cached"] = None, 0
+    missing_users = profiles.missing_embeddings()
+    if jobs or missing_users:
+        with make_encode_pool(workers) as pool:
+            if missing_users:
+                user_vecs, _ = encode_all([profiles.get(uid)["text"] for uid in missing_users], pool, workers,
+                                          REPLAY_CACHE_DIR)
+                for uid, vec in zip(missing_users, user_vecs):
+                    profiles.set_embedding(uid, vec)
+            if jobs:
+                vectors, stats["cached"] = encode_all([job.text for job in jobs], pool, workers, REPLAY_CACHE_DIR)
+    stats["encoded"], stats["encode_seconds"] = len(jobs), time.perf_counter() - t0
+
+    # 4. One semantic score matrix, adjusted and thresholded once per settings
+    user_ids, resume_vecs, skill_sets = profiles.matrix()
+    sem = np.round(vectors @ resume_vecs.T * 100, 2) if jobs and user_ids else None
+    current = alert_set(sem, jobs, first_seen, user_ids, skill_sets, match_settings(config))
+    proposed = alert_set(sem, jobs, first_seen, user_ids, skill_sets, candidate)
+
+    stats["users"] = len(user_ids)
+    stats["total_seconds"] = time.perf_counter() - t_start
+    return stats, current, proposed
+
+def _load_alerts(path):
+    with open(path, "r") as f:
+        data = json.load(f)
+    return {(alert["user_id"], alert["link"]): alert for alert in data["alerts"]}, data.get("settings", {})
+
+def _save_alerts(path, alerts, settings):
+    atomic_write_json(path, {"settings": settings, "alerts": sorted(alerts.values(), key=lambda a: a["first_seen"])})
+
+def _print_changes(label_before, label_after, before, after):
+    added, dropped, kept = compare_alerts(before, after)
+    print(f"{label_after} vs {label_before}: {len(after)} alerts ({len(added)} added, {len(dropped)} dropped, {kept} kept)")
+    for sign, alerts in (("+", added), ("-", dropped)):
+        for alert in alerts[:SHOW_CHANGES]:
+            print(f"  {sign} {alert['score']:6.2f}  user {alert['user_id']}: {alert['title']} "
+                  f"({alert['company']}) {alert['link']}")
+        if len(alerts) > SHOW_CHANGES:
+            print(f"  {sign} ... {len(alerts) - SHOW_CHANGES} more")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score archived board responses offline and compare alert sets.")
+    parser.add_argument("--threshold", type=float, help="candidate match threshold (default: config match_threshold)")
+    parser.add_argument("--skill-points", type=float, help=f"candidate points per shared skill (default {SKILL_POINTS})")
+    parser.add_argument("--max-skill-boost", type=float, help=f"candidate skill bonus cap (default {MAX_SKILL_BOOST})")
+    parser.add_argument("--senior-penalty", type=float, help=f"candidate senior-role penalty (default {SENIOR_PENALTY})")
+    parser.add_argument("--since", help="first archived day to replay (YYYY-MM-DD)")
+    parser.add_argument("--until", help="last archived day to replay (YYYY-MM-DD)")
+    parser.add_argument("--no-prefilter", action="store_true", help="score every posting, skipping the TF-IDF prefilter")
+    parser.add_argument("--workers", type=int, default=None, help="encoding processes (default: all cores)")
+    parser.add_argument("--archive", default=ARCHIVE_DIR)
+    parser.add_argument("--save", help="write the candidate alert set to this JSON file")
+    parser.add_argument("--compare", help="also compare the candidate alerts with a previously saved alert set")
+    parser.add_argument("--config", default="src/config.json")
+    args = parser.parse_args(argv)
+    with open(args.config) as f:
+        config = json.load(f)
+
+    candidate = match_settings(config, args.threshold, args.skill_points, args.max_skill_boost, args.senior_penalty)
+    use_prefilter = not args.no_prefilter and config.get("prefilter", {}).get("enabled", True)
+    stats, current, proposed = run_replay(config, candidate, args.since, args.until, args.workers,
+                                          use_prefilter, args.archive)
+    print(f"Replayed {stats['records']} responses: {stats['parsed']} postings, {stats['near_duplicates']} "
+          f"near-duplicates, {stats['prefiltered']} prefiltered, {stats['encoded']} scored "
+          f"({stats['cached']} cached embeddings) for {stats['users']} users in {stats['total_seconds']:.1f}s")
+    print(f"Current settings {match_settings(config)}: {len(current)} alerts")
+    _print_changes("current", f"candidate {candidate}", current, proposed)
+    if args.compare:
+        saved, settings = _load_alerts(args.compare)
+        _print_changes(f"saved {settings}", "candidate", saved, proposed)
+    if args.save:
+        _save_alerts(args.save, proposed, candidate)
+        print(f"Candidate alerts written to {args.save}")
+    logger.info(f"Replay of {stats['records']} archived responses: {len(current)} current alerts, "
+                f"{len(proposed)} candidate alerts ({candidate})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# src/resume_cache.py
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+from utils import atomic_write_json, load_json
+
+CACHE_DIR = "src/data/resume_cache"
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ResumeCache:
+    """
+    Derived artifacts of each résumé PDF (text, skills, validation result, embedding), computed once
+    and stored under the SHA-256 of the file. A path → (mtime, size, sha) index lets an unchanged file
+    skip re-hashing; a new upload (different mtime or size) is re-hashed and, if the bytes changed,
+    re-extracted.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._memo = {}  # sha -> artifacts dict
+
+    def _load_index(self):
+        return load_json(self.index_path, {})
+
+    def _save_index(self):
+        atomic_write_json(self.index_path, self._index)
+
+    def _sha_for(self, path):
+        st = os.stat(path)
+        entry = self._index.get(path)
+        if entry and entry["mtime"] == st.st_mtime and entry["size"] == st.st_size:
+            return entry["sha"]
+        sha = file_sha256(path)
+        self._index[path] = {"mtime": st.st_mtime, "size": st.st_size, "sha": sha}
+        self._save_index()
+        return sha
+
+    def get(self, path, compute):
+        """
+        Return the artifacts dict for a PDF: {"sha", "text", "skills", "is_resume", "embedding"}.
+        compute(path) -> {"text", "skills", "is_resume"} runs only when the file's content is new.
+        """
+        with self._lock:
+            sha = self._sha_for(path)
+            if sha in self._memo:
+                return self._memo[sha]
+            artifacts = self._read(sha)
+            if artifacts is None:
+                artifacts = dict(compute(path), sha=sha, embedding=None)
+                self._write(artifacts)
+            self._memo[sha] = artifacts
+            return artifacts
+
+    def set_embedding(self, sha, embedding):
+        """Attach the résumé embedding to cached artifacts (persisted next to them)."""
+        with self._lock:
+            embedding = np.asarray(embedding, dtype=np.float32)
+            np.save(os.path.join(self.cache_dir, f"{sha}.npy"), embedding)
+            if sha in self._memo:
+                self._memo[sha]["embedding"] = embedding
+
+    def forget(self, path):
+        """Drop the path from the index (its content-addressed artifacts stay for re-uploads)."""
+        with self._lock:
+            if self._index.pop(path, None) is not None:
+                self._save_index()
+
+    def _read(self, sha):
+        artifacts = load_json(os.path.join(self.cache_dir, f"{sha}.json"))
+        if artifacts is None:
+            return None
+        vec_path = os.path.join(self.cache_dir, f"{sha}.npy")
+        artifacts["embedding"] = np.load(vec_path) if os.path.exists(vec_path) else None
+        return artifacts
+
+    def _write(self, artifacts):
+        meta = {k: v for k, v in artifacts.items() if k != "embedding"}
+        atomic_write_json(os.path.join(self.cache_dir, f"{artifacts['sha']}.json"), meta)
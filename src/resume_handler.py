@@ -1,7 +1,25 @@
 # src/resume_handler.py
 import os
-import fitz  
-import re
+from keywords import scan
+from resume_cache import ResumeCache
+
+# Text, skills, validation and embedding of each résumé, reused until the file changes
+resume_cache = ResumeCache()
+
+def extract_text_from_pdf(file_path):
+    """Extract all page text from a PDF in one pass."""
+    import fitz  # PyMuPDF; imported on first use to keep bot startup fast
+    with fitz.open(file_path) as pdf:
+        return "".join(page.get_text() for page in pdf)
+
+def _analyze(file_path):
+    text = extract_text_from_pdf(file_path)
+    return {"text": text, "skills": extract_resume_skills(text), "is_resume": is_resume_text(text)}
+
+def get_resume_artifacts(file_path):
+    """Return cached {"sha", "text", "skills", "is_resume", "embedding"} for a résumé PDF."""
+    return resume_cache.get(file_path, _analyze)
+
 def get_resume_text():
     """Return text from the most recently uploaded resume PDF, or '' if none found."""
     data_dir = "src/data"
@@ -10,24 +28,16 @@ def get_resume_text():
 
     for file in os.listdir(data_dir):
         if file.lower().endswith(".pdf"):
-            with fitz.open(os.path.join(data_dir, file)) as pdf:
-                return "".join(page.get_text() for page in pdf)
+            return get_resume_artifacts(os.path.join(data_dir, file))["text"]
 
     return ""
 
 def is_resume_text(text):
-    keywords = ["experience", "education", "skills", "projects", "contact", "summary"]
-    matches = sum(1 for k in keywords if k in text.lower())
+    matches = len(scan(text)["resume_section"])
     return matches >= 2
 
 
 
 def extract_resume_skills(text: str):
     """Extract a skill fingerprint from the resume text."""
-    skill_keywords = [
-        "python","java","c++","c","sql","javascript","typescript","react","node","flask",
-        "django","html","css","pandas","numpy","tensorflow","pytorch",
-        "machine learning","deep learning","ai","cloud","aws","azure","docker","git"
-    ]
-    skills = [kw for kw in skill_keywords if re.search(rf"\\b{kw}\\b", text, re.I)]
-    return list(set(skills))
+    return sorted(scan(text)["skill"])
@@ -0,0 +1,84 @@
+# src/scheduler.py
+import random
+import threading
+import time
+
+from utils import atomic_write_json, load_json
+
+SCHEDULE_FILE = "src/data/poll_schedule.json"
+
+MIN_INTERVAL_SECONDS = 15 * 60        # a busy source is never polled more often than this
+MAX_INTERVAL_SECONDS = 12 * 60 * 60   # a dormant source is still polled at least this often
+INITIAL_INTERVAL_SECONDS = 60 * 60    # starting interval for a source with no history
+JITTER = 0.1                          # next-due times are spread by ±10% so sources don't sync up
+RATE_SMOOTHING = 0.3                  # weight of the latest poll in the new-postings-per-hour average
+TARGET_NEW_PER_POLL = 1.0             # aim to find about this many new postings per poll
+
+
+class PollScheduler:
+    """
+    Per-source polling schedule (e.g. "lever:stripe", "indeed:<query>").
+    Each source keeps a smoothed rate of new postings per hour and is polled again after roughly
+    TARGET_NEW_PER_POLL / rate, clamped to [min_interval, max_interval] and jittered. Busy boards
+    converge on the minimum interval; boards that stop yielding new postings drift to the maximum.
+    """
+
+    def __init__(self, path=SCHEDULE_FILE, min_interval=MIN_INTERVAL_SECONDS, max_interval=MAX_INTERVAL_SECONDS,
+                 initial_interval=INITIAL_INTERVAL_SECONDS, jitter=JITTER):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = min(max(initial_interval, min_interval), max_interval)
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self):
+        return load_json(self.path, {})
+
+    def due(self, names, now=None):
+        """The subset of names that are due; sources never polled before are always due."""
+        now = now or time.time()
+        return [name for name in names if self._state.get(name, {}).get("next_due", 0) <= now]
+
+    def next_due(self, names):
+        """Earliest next-due time among names (0 if any has never been polled)."""
+        return min((self._state.get(name, {}).get("next_due", 0) for name in names), default=0)
+
+    def record(self, name, new_postings, now=None):
+        """Update a source's rate after a poll that found new_postings; returns its next interval."""
+        now = now or time.time()
+        with self._lock:
+            entry = self._state.setdefault(
+                name, {"rate": TARGET_NEW_PER_POLL / (self.initial_interval / 3600), "interval": self.initial_interval}
+            )
+            elapsed_hours = (now - entry.get("last_polled", now - entry["interval"])) / 3600
+            observed = new_postings / max(elapsed_hours, self.min_interval / 3600)
+            entry["rate"] = RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * entry["rate"]
+
+            interval = TARGET_NEW_PER_POLL / entry["rate"] * 3600 if entry["rate"] > 0 else self.max_interval
+            interval = min(max(interval, self.min_interval), self.max_interval)
+            entry["interval"] = interval
+            entry["last_polled"] = now
+            entry["last_new"] = new_postings
+            entry["next_due"] = now + interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            return interval
+
+    def forget(self, keep):
+        """Drop schedule entries for sources that are no longer configured."""
+        with self._lock:
+            for name in set(self._state) - set(keep):
+                del self._state[name]
+
+    def report(self, names=None):
+        """Return [(name, interval, next_due, last_new, rate per hour)], soonest first."""
+        rows = [
+            (name, entry["interval"], entry["next_due"], entry.get("last_new", 0), entry["rate"])
+            for name, entry in self._state.items()
+            if names is None or name in names
+        ]
+        return sorted(rows, key=lambda row: row[2])
+
+    def save(self):
+        with self._lock:
+            atomic_write_json(self.path, self._state)
@@ -1,161 +1,453 @@
-import requests
+import asyncio
+import json
+import aiohttp
 import feedparser
 import logging
+import threading
+import time
+from urllib.parse import urlparse
+from http_cache import ResponseCache
+from archive import ResponseArchive, ARCHIVE_DIR
+from source_health import SourceHealth
+from metrics import metrics
+from pipeline import to_thread
+from keywords import scan
+from job import Job
 
 
 
-INTERNSHIP_KEYWORDS = [
-    "intern", "internship", "co-op", "co op", "coop",
-    "student", "work term","work-term","workterm", "placement", 
-    "undergraduate", "Software", "Developer","jr", "junior", 
-    "Computer Science","Computer-Science","CS","datascience",
-    "Data science","Data-science","tech","Python", "Java","C++", "C#",
-    "react", "git", "machine learning", "artificial intelligence", "AI",
-    "cloud", "aws", "azure", "docker", "git-hub", "github"
-]
-
 def is_internship_posting(text: str) -> bool:
-    return any(kw in text.lower() for kw in INTERNSHIP_KEYWORDS)
+    return bool(scan(text)["internship"])
 
 # --- 1. Lever-hosted companies ---
 LEVER_COMPANIES = [
-    "verafin", "colabsoftware","colab software", "colab-software"
+    "verafin", "colabsoftware","colab software", "colab-software",
     "stripe", "datadog", "shopify", "BMO","Lancey",
     "Welathsimple", "Microsoft", "LockheedMartin", "MorganStanley",
     "TD Bank", "TD-Bank","TDBank", "Nokia", "Shopify",
-    "Mastercard","Intel", "Cisco", "Remitly", "Amazon", "Siemens", 
+    "Mastercard","Intel", "Cisco", "Remitly", "Amazon", "Siemens",
     "IBM", "Autodesk", "lyft", "RBC", "google","pinterest", "cgi",
     "instacart", "Avalon-holographics","Avalon Holographics","AvalonHolographics", "square"
     ]
 
+DEFAULT_INDEED_QUERY = "computer+science+canada"
+
+# --- Endpoints ---
+LEVER_API = "https://api.lever.co/v0/postings"
+GREENHOUSE_API = "https://boards-api.greenhouse.io/v1/boards"
+INDEED_RSS = "https://www.indeed.com/rss"
+
+# --- HTTP client settings (one keep-alive pool shared by every source) ---
+REQUEST_TIMEOUT = 10      # seconds per request
+MAX_CONNECTIONS = 16      # open connections across all hosts
+MAX_PER_HOST = 4          # open connections to any single host (e.g. api.lever.co)
+
 logger = logging.getLogger("InternScope")
-def fetch_lever_jobs():
-    jobs = []
-    for company in LEVER_COMPANIES:
-        url = f"https://api.lever.co/v0/postings/{company}?mode=json"
-        try:
-            resp = requests.get(url, timeout=10)
-            if resp.ok:
-                for post in resp.json():
-                    text_fields = " ".join([
-                        post.get("text", ""),
-                        post.get("descriptionPlain", ""),
-                        post.get("categories", {}).get("team", "")
-                    ])
-                    if not is_internship_posting(text_fields):
-                        continue
-                    jobs.append({
-                        "title": post.get("text", ""),
-                        "company": company.capitalize(),
-                        "link": post.get("hostedUrl"),
-                        "location": post.get("categories", {}).get("location", ""),
-                        "description": post.get("descriptionPlain", ""),
-                        "source": "Lever"
-                    })
-        except Exception as e:
-            logger.warning(f"[{company}] Lever fetch failed: {e}")
-    return jobs
 
-# --- 2. Indeed RSS feed ---
-def fetch_indeed_jobs(query="computer+science+canada"):
-    url = f"https://www.indeed.com/rss?q={query}"
-    feed = feedparser.parse(url)
-    jobs = []
+# Validators and bodies of every polled URL; unchanged boards are skipped without parsing
+response_cache = ResponseCache()
+
+# Failure history per source; failing boards back off, repeat offenders are quarantined
+source_health = SourceHealth()
+
+# Raw bodies of changed responses, kept for offline replay (see replay.py); off unless enabled
+response_archive = None
+
+def enable_archive(directory=ARCHIVE_DIR):
+    """
+    Start recording response bodies, written out by commit_responses(): each URL's first response
+    (even if unchanged or a 304, so replay starts from the boards' current state) and every change.
+    """
+    global response_archive
+    response_archive = ResponseArchive(directory)
+    return response_archive
+
+def health_report():
+    """Human-readable lines describing every source that is currently being skipped."""
+    lines = []
+    for name, state, failures, retry_at, error in source_health.report():
+        retry = time.strftime("%Y-%m-%d %H:%M", time.localtime(retry_at))
+        lines.append(f"{name}: {state} after {failures} failure(s), retry {retry} ({error})")
+    return lines
+
+def make_session():
+    """Create an aiohttp session whose connector caps concurrency globally and per host."""
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=MAX_PER_HOST)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+    )
+
+_session = None
+
+def get_session():
+    """Return the shared session, creating it on first use (must be called inside the event loop)."""
+    global _session
+    if _session is None or _session.closed:
+        _session = make_session()
+    return _session
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+class FetchError(Exception):
+    """A source answered with a non-2xx status."""
+
+    def __init__(self, url, status):
+        super().__init__(f"HTTP {status} from {url}")
+        self.status = status
+
+def _purpose(skip_unchanged):
+    """Metric label separating monitor polls from ad-hoc /find_jobs searches."""
+    return "poll" if skip_unchanged else "search"
+
+async def _get(session, url, skip_unchanged=True, source=None):
+    """
+    Conditional GET of a URL. Returns the raw body and raises FetchError on a non-2xx response.
+    With skip_unchanged (monitor polls), a 304 or a body identical to the last committed one
+    returns None, and changed bodies are staged as the next baseline. While recording is
+    enabled, polls also archive changed bodies and the first body seen for each URL under source.
+    With skip_unchanged=False (ad-hoc searches), the body is always returned, the cached one for
+    a 304; nothing is staged or archived, so a search never hides new postings from the next
+    poll. Fetch metrics carry purpose="poll" or "search" accordingly.
+    """
+    host = urlparse(url).netloc
+    purpose = _purpose(skip_unchanged)
+    async with session.get(url, headers=response_cache.validators(url)) as resp:
+        if resp.status == 304:
+            logger.debug(f"{url} not modified")
+            metrics.inc("fetch_responses_total", host=host, result="not_modified", purpose=purpose)
+            if skip_unchanged and response_archive is not None and not response_archive.has_recorded(url):
+                cached = response_cache.body(url)
+                if cached is not None:
+                    response_archive.record(source or host, url, cached)
+            return None if skip_unchanged else response_cache.body(url)
+        if resp.status >= 300:
+            raise FetchError(url, resp.status)
+        body = await resp.read()
+        headers = resp.headers
+    metrics.inc("fetch_bytes_total", len(body), source=source or host, purpose=purpose)
+    if not skip_unchanged:
+        metrics.inc("fetch_responses_total", host=host, result="changed", purpose=purpose)
+        return body
+    changed = response_cache.update(url, headers, body)
+    if response_archive is not None and (changed or not response_archive.has_recorded(url)):
+        response_archive.record(source or host, url, body)
+    metrics.inc("fetch_responses_total", host=host, result="changed" if changed else "unchanged", purpose=purpose)
+    if not changed:
+        logger.debug(f"{url} body unchanged")
+        return None
+    return body
+
+# --- Parsers: lazily turn a decoded response into Job records ---
+# Each takes an optional is_seen(link) predicate that is checked before any description
+# text is normalized or keyword-filtered, so already-seen postings cost a single lookup.
+def iter_lever_postings(company, posts, is_seen=None):
+    for post in posts:
+        link = post.get("hostedUrl")
+        if is_seen and is_seen(link):
+            continue
+        categories = post.get("categories", {})
+        job = Job(
+            title=post.get("text", ""),
+            company=company.capitalize(),
+            link=link,
+            location=categories.get("location", ""),
+            description=post.get("descriptionPlain", ""),
+            source="Lever",
+            extra=categories.get("team", ""),
+        )
+        if job.is_internship:
+            yield job
+
+def iter_indeed_entries(feed, is_seen=None):
     for entry in feed.entries:
-        if not is_internship_posting(entry.title + " " + entry.summary):
+        if is_seen and is_seen(entry.link):
             continue
-        jobs.append({
-            "title": entry.title,
-            "company": "Indeed",
-            "link": entry.link,
-            "location": "",
-            "description": entry.summary,
-            "source": "Indeed"
-        })
-    return jobs
+        job = Job(title=entry.title, company="Indeed", link=entry.link, description=entry.summary, source="Indeed")
+        if job.is_internship:
+            yield job
 
-# --- 3. Workday-based postings (common format for Amazon, IBM, etc.) ---
-def fetch_workday_jobs(base_url):
+def iter_workday_page(base_url, text, is_seen=None):
+    if (is_seen and is_seen(base_url)) or not is_internship_posting(text):
+        return
+    yield Job(
+        title="Workday Internship Listing",
+        company=base_url.split(".")[0].replace("https://", "").capitalize(),
+        link=base_url,
+        description="Workday job page (parse more details later)",
+        source="Workday",
+    )
+
+def iter_greenhouse_postings(company, data, is_seen=None):
+    for post in data.get("jobs", []):
+        link = post.get("absolute_url")
+        if is_seen and is_seen(link):
+            continue
+        location = post.get("location", {}).get("name", "")
+        job = Job(
+            title=post.get("title", ""),
+            company=company.capitalize(),
+            link=link,
+            location=location,
+            description=post.get("content", ""),
+            source="Greenhouse",
+            extra=location,
+        )
+        if job.is_internship:
+            yield job
+
+def parse_lever_postings(company, posts):
+    return list(iter_lever_postings(company, posts))
+
+def parse_indeed_feed(body):
+    return list(iter_indeed_entries(feedparser.parse(body)))
+
+def parse_workday_page(base_url, text):
+    return list(iter_workday_page(base_url, text))
+
+def parse_greenhouse_postings(company, data):
+    return list(iter_greenhouse_postings(company, data))
+
+# --- Async fetchers: one coroutine per board/feed ---
+# Each returns a lazy iterator of jobs; the body is decoded on a worker thread here, and the
+# per-posting work happens wherever the iterator is consumed (also off the event loop).
+async def fetch_lever_company(session, company, is_seen=None, skip_unchanged=True):
+    body = await _get(session, f"{LEVER_API}/{company}?mode=json", skip_unchanged, source=f"lever:{company}")
+    if body is None:
+        return ()
+    posts = await to_thread(json.loads, body)
+    metrics.inc("postings_fetched_total", len(posts), source="lever", purpose=_purpose(skip_unchanged))
+    return iter_lever_postings(company, posts, is_seen)
+
+async def fetch_indeed_feed(session, query=DEFAULT_INDEED_QUERY, skip_unchanged=True, is_seen=None):
+    body = await _get(session, f"{INDEED_RSS}?q={query}", skip_unchanged, source=f"indeed:{query}")
+    if body is None:
+        return ()
+    feed = await to_thread(feedparser.parse, body)
+    metrics.inc("postings_fetched_total", len(feed.entries), source="indeed", purpose=_purpose(skip_unchanged))
+    return iter_indeed_entries(feed, is_seen)
+
+async def fetch_workday_board(session, base_url, is_seen=None):
     # Example base_url: 'https://amazonrobotics.wd5.myworkdayjobs.com/en-US/StudentPrograms'
-    jobs = []
+    body = await _get(session, base_url, source=f"workday:{urlparse(base_url).netloc}")
+    if body is None:
+        return ()
+    metrics.inc("postings_fetched_total", source="workday", purpose="poll")
+    return iter_workday_page(base_url, body.decode("utf-8", errors="replace"), is_seen)
+
+async def fetch_greenhouse_board(session, company, is_seen=None, skip_unchanged=True):
+    """Pull internship postings from a Greenhouse board."""
+    body = await _get(session, f"{GREENHOUSE_API}/{company}/jobs", skip_unchanged, source=f"greenhouse:{company}")
+    if body is None:
+        return ()
+    data = await to_thread(json.loads, body)
+    metrics.inc("postings_fetched_total", len(data.get("jobs", [])), source="greenhouse", purpose=_purpose(skip_unchanged))
+    return iter_greenhouse_postings(company, data, is_seen)
+
+# --- Source lists and concurrent gathering ---
+def build_sources(lever=LEVER_COMPANIES, greenhouse=(), indeed_queries=(DEFAULT_INDEED_QUERY,), workday=()):
+    """
+    Return (name, fetch) pairs; each fetch is a coroutine function taking the session and an
+    optional is_seen predicate, and returning a lazy iterator of jobs.
+    """
+    sources = []
+    for company in lever:
+        sources.append((f"lever:{company}", lambda s, seen=None, c=company: fetch_lever_company(s, c, seen)))
+    for company in greenhouse:
+        sources.append((f"greenhouse:{company}", lambda s, seen=None, c=company: fetch_greenhouse_board(s, c, seen)))
+    for query in indeed_queries:
+        sources.append((f"indeed:{query}", lambda s, seen=None, q=query: fetch_indeed_feed(s, q, is_seen=seen)))
+    for base_url in workday:
+        host = urlparse(base_url).netloc
+        sources.append((f"workday:{host}", lambda s, seen=None, u=base_url: fetch_workday_board(s, u, seen)))
+    return sources
+
+def lever_boards(config):
+    """Lever boards to poll: config.json "companies" followed by LEVER_COMPANIES, without repeats."""
+    return list(dict.fromkeys(list(config.get("companies", [])) + LEVER_COMPANIES))
+
+def sources_from_config(config):
+    """
+    Sources listed in config.json: "companies" (Lever boards, polled alongside LEVER_COMPANIES),
+    "greenhouse_boards", "indeed_queries" and "workday_boards".
+    """
+    return build_sources(
+        lever=lever_boards(config),
+        greenhouse=config.get("greenhouse_boards", ()),
+        indeed_queries=config.get("indeed_queries", (DEFAULT_INDEED_QUERY,)),
+        workday=config.get("workday_boards", ()),
+    )
+
+async def iter_source_results(sources, session=None, is_seen=None):
+    """Fetch every source concurrently, yielding (name, lazy job iterator) as each one completes."""
+    session = session or get_session()
+
+    async def run(name, fetch):
+        t0 = time.perf_counter()
+        try:
+            jobs = await fetch(session, is_seen)
+        except Exception as e:
+            metrics.inc("fetch_failures_total", source=name)
+            state = source_health.record_failure(name, e, getattr(e, "status", None))
+            logger.warning(f"[{name}] fetch failed ({state}): {e}")
+            return name, ()
+        finally:
+            metrics.observe("fetch_seconds", time.perf_counter() - t0, source=name)
+        source_health.record_success(name)
+        return name, jobs
+
+    due = [(name, fetch) for name, fetch in sources if source_health.should_fetch(name)]
+    metrics.set("sources_skipped", len(sources) - len(due))
+    if len(due) < len(sources):
+        logger.info(f"Skipping {len(sources) - len(due)} sources that are backing off or quarantined.")
+    tasks = [asyncio.ensure_future(run(name, fetch)) for name, fetch in due]
     try:
-        resp = requests.get(base_url, timeout=10)
-        if resp.ok:
-            text = resp.text
-            if not is_internship_posting(text):
-                return jobs
-            jobs.append({
-                "title": "Workday Internship Listing",
-                "company": base_url.split(".")[0].replace("https://", "").capitalize(),
-                "link": base_url,
-                "location": "",
-                "description": "Workday job page (parse more details later)",
-                "source": "Workday"
-            })
-    except Exception as e:
-        logger.warning(f"[Workday] fetch failed: {e}")
-    return jobs
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
 
-def fetch_greenhouse_jobs(company):
-    """Pull internship postings from Greenhouse boards."""
-    url = f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
-    jobs = []
+async def gather_all_jobs_async(sources=None, session=None, is_seen=None):
+    """
+    Collect new postings from every source into one list. Sources whose response is unchanged
+    since the last commit_responses() contribute nothing; call it once the jobs are processed.
+    """
+    sources = build_sources() if sources is None else sources
+    all_jobs = []
+    async for name, jobs in iter_source_results(sources, session, is_seen):
+        all_jobs.extend(await to_thread(list, jobs))
+    metrics.inc("postings_parsed_total", len(all_jobs))
+    await to_thread(source_health.save)
+    return all_jobs
+
+STREAM_BATCH_SIZE = 64   # postings handed to scoring at a time
+STREAM_QUEUE_SIZE = 256  # postings buffered between the parsers and scoring
+
+async def stream_new_jobs(sources=None, is_seen=None, batch_size=STREAM_BATCH_SIZE,
+                          queue_size=STREAM_QUEUE_SIZE, session=None, new_counts=None):
+    """
+    Async generator of batches of unseen postings, streamed from every source as they are parsed.
+    Parsing runs on worker threads that block once queue_size postings are waiting, so memory
+    is bounded by the queue and batch size rather than by the total size of all boards.
+    Postings whose link appears twice in the same cycle are only yielded once.
+    If new_counts is a dict, it receives source name -> unseen postings parsed, for every source
+    that was fetched (0 for unchanged, empty or failed ones).
+    """
+    sources = build_sources() if sources is None else sources
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    done = object()
+    stop = threading.Event()
+
+    def drain(name, jobs):
+        count = 0
+        try:
+            for job in jobs:
+                if stop.is_set():
+                    return
+                asyncio.run_coroutine_threadsafe(queue.put(job), loop).result()
+                count += 1
+        finally:
+            if new_counts is not None:
+                new_counts[name] = count
+
+    async def produce():
+        try:
+            parsers = []
+            async for name, jobs in iter_source_results(sources, session, is_seen):
+                parsers.append(asyncio.create_task(to_thread(drain, name, jobs)))
+            for task in parsers:
+                try:
+                    await task
+                except Exception as e:
+                    logger.warning(f"Parsing a source failed: {e}")
+            await to_thread(source_health.save)
+        finally:
+            await queue.put(done)
+
+    producer = asyncio.create_task(produce())
+    batch, cycle_links = [], set()
     try:
-        resp = requests.get(url, timeout=10)
-        if not resp.ok:
-            return jobs
-        data = resp.json()
-        for post in data.get("jobs", []):
-            text = (post.get("title", "") + " " +
-                    post.get("content", "") + " " +
-                    post.get("location", {}).get("name", ""))
-            if not is_internship_posting(text):
+        while (job := await queue.get()) is not done:
+            metrics.inc("postings_parsed_total")
+            if job.link in cycle_links:
+                metrics.inc("postings_deduped_total", stage="link")
                 continue
-            jobs.append({
-                "title": post.get("title", ""),
-                "company": company.capitalize(),
-                "link": post.get("absolute_url"),
-                "location": post.get("location", {}).get("name", ""),
-                "description": post.get("content", ""),
-                "source": "Greenhouse"
-            })
+            cycle_links.add(job.link)
+            batch.append(job)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        # Consumer stopped early: release parser threads blocked on a full queue
+        stop.set()
+        producer.cancel()
+        while not queue.empty():
+            queue.get_nowait()
+
+def commit_responses():
+    """Persist the responses seen this cycle as the baseline for the next conditional requests."""
+    response_cache.commit()
+    if response_archive is not None:
+        response_archive.flush()
+
+async def fetch_indeed_query_async(query: str, session=None):
+    """
+    Fetch Indeed postings for a custom search query (always returns the full result set).
+    Read-only with respect to the monitor: the response is not staged as a baseline and nothing
+    is committed, so a search in the middle of a cycle never commits that cycle's unprocessed bodies.
+    """
+    try:
+        feed = await fetch_indeed_feed(session or get_session(), query.replace(' ', '+'), skip_unchanged=False)
+        jobs = await to_thread(list, feed)
     except Exception as e:
-        logger.warning(f"[Greenhouse] {company} fetch failed: {e}")
+        logger.warning(f"[Indeed] '{query}' fetch failed: {e}")
+        return []
+    logger.info(f"Fetched {len(jobs)} Indeed results for '{query}'.")
     return jobs
 
+# --- Synchronous wrappers (scripts / REPL); each run gets its own short-lived session ---
+def _run(fetch, commit=True):
+    async def main():
+        async with make_session() as session:
+            return await fetch(session)
+    result = asyncio.run(main())
+    if commit:
+        commit_responses()
+    return result
+
+def fetch_lever_jobs():
+    return _run(lambda s: gather_all_jobs_async(build_sources(indeed_queries=()), s))
+
+def fetch_indeed_jobs(query=DEFAULT_INDEED_QUERY):
+    return _run(lambda s: gather_all_jobs_async(build_sources(lever=(), indeed_queries=(query,)), s))
+
+def fetch_workday_jobs(base_url):
+    return _run(lambda s: gather_all_jobs_async(build_sources(lever=(), indeed_queries=(), workday=(base_url,)), s))
+
+def fetch_greenhouse_jobs(company):
+    """Pull internship postings from Greenhouse boards."""
+    return _run(lambda s: gather_all_jobs_async(build_sources(lever=(), greenhouse=(company,), indeed_queries=()), s))
 
 def fetch_indeed_query(query: str):
     """Fetch Indeed postings for a custom search query."""
-    url = f"https://www.indeed.com/rss?q={query.replace(' ', '+')}"
-    feed = feedparser.parse(url)
-    jobs = []
-    for entry in feed.entries:
-        text = entry.title + " " + entry.summary
-        if not is_internship_posting(text):
-            continue
-        jobs.append({
-            "title": entry.title,
-            "company": "Indeed",
-            "link": entry.link,
-            "location": "",
-            "description": entry.summary,
-            "source": "Indeed"
-        })
-    logger.info(f"Fetched {len(jobs)} Indeed results for '{query}'.")
-    return jobs
+    return _run(lambda s: fetch_indeed_query_async(query, s), commit=False)
 
 # --- Combine all sources ---
 def gather_all_jobs():
-    all_jobs = []
-    all_jobs.extend(fetch_lever_jobs())
-    all_jobs.extend(fetch_indeed_jobs())
     # add Workday if needed
-    # all_jobs.extend(fetch_workday_jobs("https://amazonrobotics.wd5.myworkdayjobs.com/en-US/StudentPrograms"))
-    return all_jobs
+    # build_sources(workday=["https://amazonrobotics.wd5.myworkdayjobs.com/en-US/StudentPrograms"])
+    return _run(lambda s: gather_all_jobs_async(build_sources(), s))
 
 if __name__ == "__main__":
     jobs = gather_all_jobs()
     logger.info(f"Found {len(jobs)} internship postings.")
     for j in jobs[:5]:
         logger.info(f"- {j['company']}: {j['title']} ({j['source']})")
-
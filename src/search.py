@@ -0,0 +1,120 @@
+# src/search.py
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import metrics
+from scraper import (
+    get_session, lever_boards, fetch_lever_company, fetch_greenhouse_board, fetch_indeed_feed,
+    source_health,
+)
+
+SEARCH_TIMEOUT_SECONDS = 8        # a source slower than this is left out of the answer
+RESULT_TTL_SECONDS = 15 * 60      # how long a query's results are reused
+PARTIAL_TTL_SECONDS = 60          # shorter reuse when some source timed out or failed
+RESULT_CACHE_SIZE = 256           # queries kept; least recently used are evicted first
+
+logger = logging.getLogger("InternScope")
+
+
+def normalize_query(query):
+    """Cache key and search terms for a query: casefolded unique words, sorted."""
+    return " ".join(sorted(set(query.casefold().split())))
+
+
+class QueryCache:
+    """
+    Bounded TTL cache for /find_jobs results. Entries expire after their TTL and, once
+    max_entries is reached, the least recently used entry is evicted.
+    """
+
+    def __init__(self, ttl=RESULT_TTL_SECONDS, max_entries=RESULT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key):
+        """Return the cached value, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def search_sources(terms, config):
+    """
+    (name, fetch) pairs for one query: the Indeed RSS search for the terms, and every configured
+    Lever and Greenhouse board (filtered locally). Fetches read the boards without moving the
+    monitor's conditional-request baseline.
+    """
+    query = "+".join(terms.split())
+    sources = [(f"indeed:{query}", lambda s: fetch_indeed_feed(s, query, skip_unchanged=False))]
+    for company in lever_boards(config):
+        sources.append((f"lever:{company}", lambda s, c=company: fetch_lever_company(s, c, skip_unchanged=False)))
+    for company in config.get("greenhouse_boards", ()):
+        sources.append((f"greenhouse:{company}",
+                        lambda s, c=company: fetch_greenhouse_board(s, c, skip_unchanged=False)))
+    return sources
+
+def _matching(jobs, words):
+    """Internship postings (the parsers already filter on those) containing every query word."""
+    return [job for job in jobs if all(word in job.lower for word in words)]
+
+async def search_jobs(terms, config, session=None, timeout=SEARCH_TIMEOUT_SECONDS):
+    """
+    Fan a normalized query out to every source concurrently. Async generator of (name, jobs)
+    in completion order; a source that fails or exceeds timeout yields (name, None).
+    Sources that are backing off or quarantined are not queried.
+    """
+    session = session or get_session()
+    words = terms.split()
+
+    async def fetch_matching(fetch):
+        jobs = await fetch(session)
+        return await asyncio.to_thread(_matching, jobs, words)
+
+    async def run(name, fetch):
+        t0 = time.perf_counter()
+        try:
+            return name, await asyncio.wait_for(fetch_matching(fetch), timeout)
+        except asyncio.TimeoutError:
+            metrics.inc("search_timeouts_total", source=name)
+            logger.info(f"[{name}] search timed out after {timeout}s")
+            return name, None
+        except Exception as e:
+            metrics.inc("search_failures_total", source=name)
+            logger.warning(f"[{name}] search failed: {e}")
+            return name, None
+        finally:
+            metrics.observe("search_source_seconds", time.perf_counter() - t0, source=name)
+
+    sources = [(name, fetch) for name, fetch in search_sources(terms, config) if source_health.should_fetch(name)]
+    tasks = [asyncio.ensure_future(run(name, fetch)) for name, fetch in sources]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
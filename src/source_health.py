@@ -0,0 +1,74 @@
+# src/source_health.py
+import threading
+import time
+
+from utils import atomic_write_json, load_json
+
+HEALTH_FILE = "src/data/source_health.json"
+
+BACKOFF_BASE_SECONDS = 15 * 60        # first retry delay after a failure
+BACKOFF_MAX_SECONDS = 12 * 60 * 60    # backoff never grows past this
+FAILURE_THRESHOLD = 5                 # consecutive failures before the circuit opens
+QUARANTINE_SECONDS = 24 * 60 * 60     # how long an open circuit keeps a source out
+NOT_FOUND_TTL_SECONDS = 7 * 24 * 60 * 60  # confirmed 404s are re-checked weekly
+
+
+class SourceHealth:
+    """
+    Tracks fetch outcomes per source (e.g. "lever:stripe").
+    Failures back off exponentially; after FAILURE_THRESHOLD in a row the circuit opens and the
+    source is quarantined. A 404 puts the source in a persisted negative cache instead.
+    After a quarantine or negative-cache entry expires the source gets one trial fetch.
+    """
+
+    def __init__(self, path=HEALTH_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self):
+        return load_json(self.path, {})
+
+    def should_fetch(self, name, now=None):
+        """False while the source is backing off, quarantined or known to be missing."""
+        entry = self._state.get(name)
+        if entry is None:
+            return True
+        return (now or time.time()) >= entry.get("retry_at", 0)
+
+    def record_success(self, name):
+        with self._lock:
+            self._state.pop(name, None)
+
+    def record_failure(self, name, error, status=None, now=None):
+        now = now or time.time()
+        with self._lock:
+            entry = self._state.setdefault(name, {"failures": 0})
+            entry["failures"] += 1
+            entry["last_error"] = str(error)[:200]
+            entry["status"] = status
+            if status == 404:
+                entry["state"] = "not_found"
+                entry["retry_at"] = now + NOT_FOUND_TTL_SECONDS
+            elif entry["failures"] >= FAILURE_THRESHOLD:
+                entry["state"] = "quarantined"
+                entry["retry_at"] = now + QUARANTINE_SECONDS
+            else:
+                entry["state"] = "backoff"
+                delay = BACKOFF_BASE_SECONDS * 2 ** (entry["failures"] - 1)
+                entry["retry_at"] = now + min(delay, BACKOFF_MAX_SECONDS)
+            return entry["state"]
+
+    def report(self, now=None):
+        """Return [(name, state, failures, retry_at, last_error)] for every unhealthy source."""
+        now = now or time.time()
+        rows = []
+        for name, entry in sorted(self._state.items()):
+            if entry.get("retry_at", 0) <= now:
+                continue
+            rows.append((name, entry["state"], entry["failures"], entry["retry_at"], entry.get("last_error", "")))
+        return rows
+
+    def save(self):
+        with self._lock:
+            atomic_write_json(self.path, self._state)
@@ -1,22 +1,145 @@
-import json, os
+import json, os, sqlite3, threading, time
 
-DATA_FILE = "src/data/seen_jobs.json"
+DB_FILE = "src/data/seen_jobs.db"
+DATA_FILE = "src/data/seen_jobs.json"  # legacy whole-file store, imported once on first open
+SEEN_TTL_DAYS = 180  # postings no longer listed for this long are forgotten
+
+
+class SeenStore:
+    """
+    SQLite-backed record of every job link already processed, with first- and last-seen times,
+    score and source. Behaves like a set for `in`, len() and iteration; add() stages a link and
+    commit() writes all staged links in one transaction, so a crash mid-save never loses earlier
+    history. check() is the membership test for fetched postings: it also records that the
+    posting is still listed, and expiry goes by that last-seen time.
+    """
+
+    def __init__(self, path=DB_FILE, legacy_path=DATA_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        is_new = not os.path.exists(path)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._touched = set()  # seen links found listed again since the last commit
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_jobs ("
+            " link TEXT PRIMARY KEY,"
+            " first_seen REAL NOT NULL,"
+            " score REAL,"
+            " source TEXT,"
+            " last_seen REAL)"
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(seen_jobs)")}
+        if "last_seen" not in columns:  # stores created before last_seen was tracked
+            self.conn.execute("ALTER TABLE seen_jobs ADD COLUMN last_seen REAL")
+            self.conn.execute("UPDATE seen_jobs SET last_seen = first_seen")
+        self.conn.execute("DROP INDEX IF EXISTS seen_jobs_first_seen")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_jobs_last_seen ON seen_jobs(last_seen)")
+        self.conn.commit()
+        if is_new and legacy_path:
+            self._import_legacy(legacy_path)
+
+    def _import_legacy(self, legacy_path):
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, "r") as f:
+                content = f.read().strip()
+            links = json.loads(content) if content else []
+        except (json.JSONDecodeError, ValueError):
+            return
+        for link in links:
+            self.add(link)
+        self.commit()
+
+    def _stored(self, link):
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM seen_jobs WHERE link = ?", (link,)).fetchone()
+        return row is not None
+
+    def __contains__(self, link):
+        return link in self._pending or self._stored(link)
+
+    def check(self, link):
+        """`link in self`, and when it is, mark the posting as still listed (written on commit)."""
+        if link in self:
+            self._touched.add(link)
+            return True
+        return False
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self.conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()
+        return count + sum(1 for link in list(self._pending) if not self._stored(link))
+
+    def __iter__(self):
+        with self._lock:
+            links = {row[0] for row in self.conn.execute("SELECT link FROM seen_jobs")}
+        yield from links
+        yield from (link for link in list(self._pending) if link not in links)
+
+    def add(self, link, score=None, source=None):
+        """Stage a link (and optional metadata) to be written on the next commit()."""
+        if link:
+            now = time.time()
+            self._pending[link] = (link, now, score, source, now)
+
+    def commit(self):
+        """
+        Insert every staged link and bump last_seen for links check() found again, in a single
+        transaction; existing links keep their first_seen.
+        """
+        pending, self._pending = self._pending, {}
+        touched, self._touched = self._touched, set()
+        if not pending and not touched:
+            return
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_jobs (link, first_seen, score, source, last_seen) VALUES (?, ?, ?, ?, ?)",
+                list(pending.values()),
+            )
+            self.conn.executemany("UPDATE seen_jobs SET last_seen = ? WHERE link = ?", [(now, link) for link in touched])
+
+    def expire(self, days=SEEN_TTL_DAYS):
+        """Forget postings not seen listed for more than `days`; returns how many were removed."""
+        cutoff = time.time() - days * 24 * 60 * 60
+        with self._lock, self.conn:
+            cur = self.conn.execute("DELETE FROM seen_jobs WHERE last_seen < ?", (cutoff,))
+        return cur.rowcount
+
+    def get(self, link):
+        """Return {first_seen, last_seen, score, source} for a link, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT first_seen, last_seen, score, source FROM seen_jobs WHERE link = ?", (link,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"first_seen": row[0], "last_seen": row[1], "score": row[2], "source": row[3]}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_store = None
 
 def load_seen_jobs():
-    """Return a set of already-seen job links, or an empty set if file missing/invalid."""
-    if not os.path.exists(DATA_FILE):
-        return set()
-    try:
-        with open(DATA_FILE, "r") as f:
-            content = f.read().strip()
-            if not content:
-                return set()
-            return set(json.loads(content))
-    except (json.JSONDecodeError, ValueError):
-        # file exists but has invalid/empty JSON
-        return set()
+    """Return the seen-jobs store (opened once per process; set-like membership checks)."""
+    global _store
+    if _store is None:
+        _store = SeenStore()
+    return _store
 
 def save_seen_jobs(seen):
-    os.makedirs("src/data", exist_ok=True)
-    with open(DATA_FILE, "w") as f:
-        json.dump(list(seen), f)
+    """Commit newly seen links and expire old ones; returns how many expired.
+    Accepts the store itself or any iterable of links."""
+    store = seen if isinstance(seen, SeenStore) else load_seen_jobs()
+    if store is not seen:
+        for link in seen:
+            if link not in store:
+                store.add(link)
+    store.commit()
+    return store.expire()
@@ -0,0 +1,70 @@
+# src/stub_server.py
+import asyncio
+import threading
+
+from aiohttp import web
+
+
+class StubBoardServer:
+    """
+    Local HTTP server that answers like the job boards and the Discord webhook, so the scraper
+    and notifier can be exercised without network access. Runs its own event loop on a daemon
+    thread; register bodies with add() and point the scraper's endpoint constants at url().
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.routes = {}       # path -> (body, content type)
+        self.webhook_posts = 0
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    def add(self, path, body, content_type="application/json"):
+        self.routes[path] = (body, content_type)
+
+    def url(self, path=""):
+        return f"http://{self.host}:{self.port}{path}"
+
+    async def _handle(self, request):
+        if request.path == "/webhook":
+            await request.read()
+            self.webhook_posts += 1
+            return web.Response(status=204, headers={"X-RateLimit-Remaining": "5"})
+        route = self.routes.get(request.path)
+        if route is None:
+            return web.Response(status=404)
+        body, content_type = route
+        return web.Response(body=body, content_type=content_type)
+
+    async def _start(self):
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,20 @@
+import tempfile
+from unittest import mock
+
+from http_cache import ResponseCache, MAX_BASELINE_AGE_SECONDS
+
+DAY = 24 * 60 * 60
+
+# A board answering 200 with the same body and no validators, polled daily: it is skipped as
+# unchanged until its baseline is older than max_age, then parsed again once
+with tempfile.TemporaryDirectory() as cache_dir, mock.patch("http_cache.time.time") as clock:
+    cache = ResponseCache(cache_dir)
+    url, body = "https://example.com/board", b'{"jobs": []}'
+    changed_days = []
+    for day in range(2 * MAX_BASELINE_AGE_SECONDS // DAY + 5):
+        clock.return_value = day * DAY
+        if cache.update(url, {}, body):
+            changed_days.append(day)
+        cache.commit()
+    print("parsed on days", changed_days)
+    assert changed_days == [0, 31, 62], changed_days
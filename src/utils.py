@@ -0,0 +1,42 @@
+# src/utils.py
+import json
+import os
+
+import numpy as np
+
+
+# --- State files: written to a temporary file and swapped in, so readers never see half a file ---
+def _replace(path, write, suffix=".tmp"):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + suffix
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def atomic_write(path, data):
+    """Replace path with data (str or bytes)."""
+    def write(tmp_path):
+        with open(tmp_path, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+    _replace(path, write)
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """Replace path with data serialized as JSON."""
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, **dump_kwargs)
+    _replace(path, write)
+
+def atomic_savez(path, compressed=False, **arrays):
+    """Replace path with an .npz archive of arrays."""
+    save = np.savez_compressed if compressed else np.savez
+    _replace(path, lambda tmp_path: save(tmp_path, **arrays), suffix=".tmp.npz")
+
+def load_json(path, default=None):
+    """Parsed contents of a JSON file, or default when it is missing or not valid JSON."""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except ValueError:  # includes json.JSONDecodeError
+        return default
@@ -0,0 +1,156 @@
+# src/vector_index.py
+import json
+import os
+import threading
+
+import numpy as np
+
+from job import Job
+from utils import atomic_write_json
+
+INDEX_DIR = "src/data/job_index"
+
+
+class JobIndex:
+    """
+    Local search index over every collected posting: a matrix of unit-length embeddings
+    (one row per posting) plus the posting metadata. Both files are append-only, so each
+    monitor cycle only writes the postings it added. prune() drops postings that have left the
+    seen store by writing a new generation of both files and switching meta.json over to it.
+    """
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        self.meta_path = os.path.join(index_dir, "meta.json")
+        self._set_generation(0)
+        self.dim = None
+        self._lock = threading.Lock()
+        self.jobs = []
+        self.links = set()
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self._load()
+
+    def _set_generation(self, generation):
+        suffix = f".{generation}" if generation else ""
+        self.generation = generation
+        self.vectors_path = os.path.join(self.index_dir, f"vectors{suffix}.f32")
+        self.jobs_path = os.path.join(self.index_dir, f"jobs{suffix}.jsonl")
+
+    def _write_meta(self, dim, generation):
+        atomic_write_json(self.meta_path, {"dim": dim, "generation": generation})
+
+    def _load(self):
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, "r") as f:
+            meta = json.load(f)
+        dim = meta["dim"]
+        self._set_generation(meta.get("generation", 0))
+        if not (os.path.exists(self.jobs_path) and os.path.exists(self.vectors_path)):
+            return
+        with open(self.jobs_path, "r") as f:
+            jobs = [Job.from_dict(json.loads(line)) for line in f if line.strip()]
+        flat = np.fromfile(self.vectors_path, dtype=np.float32)
+        # A crash between the two appends can leave one file a row ahead; keep the common prefix
+        rows = min(len(jobs), flat.size // dim)
+        if rows != len(jobs) or rows * dim != flat.size:
+            flat[: rows * dim].tofile(self.vectors_path)
+            with open(self.jobs_path, "w") as f:
+                f.writelines(json.dumps(job.to_dict()) + "\n" for job in jobs[:rows])
+        self.dim = dim
+        self.vectors = flat[: rows * dim].reshape(rows, dim)
+        for job in jobs[:rows]:
+            self._remember(job)
+
+    def _remember(self, job):
+        self.jobs.append(job)
+        self.links.add(job.link)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add(self, jobs, vectors):
+        """Append postings not already indexed, with their embeddings; returns how many were added."""
+        fresh, batch_links = [], set()
+        for job, vec in zip(jobs, vectors):
+            if not isinstance(job, Job):
+                job = Job.from_dict(job)
+            if job.link and job.link not in self.links and job.link not in batch_links:
+                batch_links.add(job.link)
+                fresh.append((job, vec))
+        if not fresh:
+            return 0
+        new_vectors = np.asarray([vec for _, vec in fresh], dtype=np.float32)
+        with self._lock:
+            os.makedirs(self.index_dir, exist_ok=True)
+            if not os.path.exists(self.meta_path):
+                self._write_meta(new_vectors.shape[1], self.generation)
+            with open(self.vectors_path, "ab") as f:
+                new_vectors.tofile(f)
+            with open(self.jobs_path, "a") as f:
+                for job, _ in fresh:
+                    f.write(json.dumps(job.to_dict()) + "\n")
+            self.vectors = np.vstack([self.vectors, new_vectors]) if len(self.vectors) else new_vectors
+            self.dim = new_vectors.shape[1]
+            for job, _ in fresh:
+                self._remember(job)
+        return len(fresh)
+
+    def prune(self, live_links):
+        """
+        Drop postings whose link is not in live_links (e.g. expired from the seen store) and
+        compact both files; returns how many were removed.
+        """
+        with self._lock:
+            keep = [i for i, job in enumerate(self.jobs) if job.link in live_links]
+            removed = len(self.jobs) - len(keep)
+            if not removed:
+                return 0
+            jobs, vectors = [self.jobs[i] for i in keep], self.vectors[keep]
+            old_paths = (self.vectors_path, self.jobs_path)
+            self._set_generation(self.generation + 1)
+            vectors.tofile(self.vectors_path)
+            with open(self.jobs_path, "w") as f:
+                f.writelines(json.dumps(job.to_dict()) + "\n" for job in jobs)
+            self._write_meta(self.dim, self.generation)  # the switch: a crash before it keeps the old files
+            for path in old_paths:
+                os.remove(path)
+            self.jobs, self.links = [], set()
+            self.vectors = vectors
+            for job in jobs:
+                self._remember(job)
+        return removed
+
+    def search(self, query_vec, k=5, keywords=None):
+        """
+        Return up to k (similarity, job) pairs, best first. With keywords, only postings whose
+        text contains every keyword are considered.
+        """
+        with self._lock:
+            vectors, jobs = self.vectors, self.jobs
+        if not jobs:
+            return []
+        if keywords:
+            terms = [kw.lower() for kw in keywords]
+            rows = np.array([i for i, job in enumerate(jobs) if all(term in job.lower for term in terms)],
+                            dtype=np.intp)
+            if rows.size == 0:
+                return []
+        else:
+            rows = np.arange(len(jobs))
+
+        sims = vectors[rows] @ np.asarray(query_vec, dtype=np.float32)
+        k = min(k, sims.size)
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return [(float(sims[i]), jobs[rows[i]]) for i in top]
+
+
+_index = None
+
+def load_job_index():
+    """Return the local job index (loaded from disk once per process)."""
+    global _index
+    if _index is None:
+        _index = JobIndex()
+    return _index